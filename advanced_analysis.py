@@ -1,136 +1,188 @@
 import pandas as pd
 import numpy as np
-from typing import Tuple, Optional, Dict, List
-from scipy import stats
-
-from config import (
-    DRIVER_ROOKIE_MAPPING,
-    ROOKIE_DRIVERS,
-    REGULAR_DRIVERS,
-    TEAM_MAPPING,
-    ROOKIE_FULL_NAMES,
-    REGULAR_FULL_NAMES,
-    ALL_DRIVER_NAMES,
-    FUEL_EFFECT_PER_KG,
-    FUEL_CONSUMPTION_KG_PER_LAP,
-    ESTIMATED_START_FUEL_KG,
-    TIRE_DEGRADATION_ESTIMATES,
-    MIN_LAPS_FOR_DEGRADATION,
-    TRACK_EVOLUTION_WINDOW_MINUTES,
-    OUTLIER_THRESHOLD_PERCENT,
-)
-from data_collector import get_lap_data
-
-
-def add_stint_info(laps: pd.DataFrame, gap_threshold_seconds: float = 300) -> pd.DataFrame:
-    laps = laps.copy()
-    result_frames = []
+from functools import cached_property
+from typing import Callable, Tuple, Optional, Dict, List
+
+from data_collector import get_lap_data, get_driver_info
+from bootstrap import bootstrap_pair_deficits
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
+
+
+PAIRING_MODES = ("teammate", "all-vs-all", "rookie-vs-field")
+
+
+def add_stint_info(
+    laps: pd.DataFrame,
+    gap_threshold_seconds: float = 300,
+    copy: bool = True,
+) -> pd.DataFrame:
+    if laps.empty:
+        return laps.copy(deep=copy)
     
-    for driver in laps["Driver"].unique():
-        driver_laps = laps[laps["Driver"] == driver].sort_values("LapStartTime").copy()
-        
-        if driver_laps.empty:
-            continue
-        
-        driver_laps["TimeSincePrevLap"] = driver_laps["LapStartTime"].diff().dt.total_seconds()
-        driver_laps["CompoundChange"] = driver_laps["Compound"] != driver_laps["Compound"].shift(1)
-        driver_laps["NewStint"] = (
-            (driver_laps["TimeSincePrevLap"] > gap_threshold_seconds) |
-            driver_laps["CompoundChange"] |
-            driver_laps["TimeSincePrevLap"].isna()
-        )
-        driver_laps["StintNumber"] = driver_laps["NewStint"].cumsum()
-        
-        stint_lap_counts = driver_laps.groupby("StintNumber").cumcount() + 1
-        driver_laps["TyreLap"] = stint_lap_counts
-        
-        result_frames.append(driver_laps)
+    sort_keys = pd.DataFrame({
+        "DriverOrder": pd.factorize(laps["Driver"])[0],
+        "LapStartTime": laps["LapStartTime"].to_numpy(),
+    })
+    order = sort_keys.sort_values(["DriverOrder", "LapStartTime"], kind="mergesort").index.to_numpy()
+    
+    if (order != np.arange(len(order))).any():
+        laps = laps.take(order)
+    else:
+        laps = laps.copy(deep=copy)
+    laps.reset_index(drop=True, inplace=True)
+    
+    by_driver = laps.groupby("Driver", sort=False, observed=True)
+    laps["TimeSincePrevLap"] = by_driver["LapStartTime"].diff().dt.total_seconds()
+    laps["CompoundChange"] = laps["Compound"] != by_driver["Compound"].shift(1)
+    laps["NewStint"] = (
+        (laps["TimeSincePrevLap"] > gap_threshold_seconds) |
+        laps["CompoundChange"] |
+        laps["TimeSincePrevLap"].isna()
+    )
+    laps["StintNumber"] = by_driver["NewStint"].cumsum().astype("int16")
+    laps["TyreLap"] = (laps.groupby(["Driver", "StintNumber"], sort=False, observed=True).cumcount() + 1).astype("int16")
     
-    return pd.concat(result_frames, ignore_index=True)
+    return laps
+
+
+def estimate_fuel_load_array(lap_numbers, config: RunConfig = DEFAULT_RUN_CONFIG) -> np.ndarray:
+    laps_completed = np.asarray(lap_numbers, dtype=float) - 1
+    fuel_burned = laps_completed * config.fuel_consumption_kg_per_lap
+    return np.maximum(config.estimated_start_fuel_kg - fuel_burned, 5)
 
 
-def estimate_fuel_load(lap_number: int, session_total_laps: int = 30) -> float:
-    laps_completed = lap_number - 1
-    fuel_burned = laps_completed * FUEL_CONSUMPTION_KG_PER_LAP
-    return max(ESTIMATED_START_FUEL_KG - fuel_burned, 5)
+def estimate_fuel_load(lap_number: int, session_total_laps: int = 30, config: RunConfig = DEFAULT_RUN_CONFIG) -> float:
+    return float(estimate_fuel_load_array(lap_number, config))
 
 
-def calculate_fuel_correction(lap_number: int, reference_lap: int = 1) -> float:
-    fuel_at_lap = estimate_fuel_load(lap_number)
-    fuel_at_reference = estimate_fuel_load(reference_lap)
+def calculate_fuel_correction_array(lap_numbers, reference_lap: int = 1, config: RunConfig = DEFAULT_RUN_CONFIG) -> np.ndarray:
+    fuel_at_lap = estimate_fuel_load_array(lap_numbers, config)
+    fuel_at_reference = estimate_fuel_load_array(reference_lap, config)
     fuel_difference = fuel_at_lap - fuel_at_reference
-    return fuel_difference * FUEL_EFFECT_PER_KG
+    return fuel_difference * config.fuel_effect_per_kg
+
+
+def calculate_fuel_correction(lap_number: int, reference_lap: int = 1, config: RunConfig = DEFAULT_RUN_CONFIG) -> float:
+    return float(calculate_fuel_correction_array(lap_number, reference_lap, config))
 
 
-def add_fuel_corrected_times(laps: pd.DataFrame) -> pd.DataFrame:
+def add_fuel_corrected_times(laps: pd.DataFrame, config: RunConfig = DEFAULT_RUN_CONFIG) -> pd.DataFrame:
     laps = laps.copy()
     median_lap = laps["LapNumber"].median()
     
-    laps["FuelCorrection"] = laps["LapNumber"].apply(
-        lambda x: calculate_fuel_correction(x, int(median_lap))
-    )
+    laps["FuelCorrection"] = calculate_fuel_correction_array(
+        laps["LapNumber"].to_numpy(), int(median_lap), config
+    ).astype("float32")
     laps["FuelCorrectedTime"] = laps["LapTimeSeconds"] + laps["FuelCorrection"]
     
     return laps
 
 
-def calculate_track_evolution_model(session) -> pd.DataFrame:
-    laps = get_lap_data(session)
-    laps = laps.copy()
+def linear_evolution_fit(x: np.ndarray, y: np.ndarray, config: RunConfig = DEFAULT_RUN_CONFIG) -> Tuple[float, float, float]:
+    from scipy import stats
+    
+    slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
+    slope = float(np.clip(slope, -config.max_track_evolution_rate, config.max_track_evolution_rate))
+    return slope, intercept, r_value ** 2
+
+
+def calculate_track_evolution_breakdown(
+    session,
+    window_minutes: Optional[float] = None,
+    by_compound: bool = True,
+    by_sector: bool = True,
+    fit: Optional[Callable[[np.ndarray, np.ndarray], Tuple[float, float, float]]] = None,
+    min_laps_per_window: int = 3,
+    min_windows_for_fit: int = 3,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    session = as_prepared_session(session, config)
+    laps = session.base_laps
+    window_minutes = window_minutes if window_minutes is not None else config.track_evolution_window_minutes
     
     best_time = laps["LapTimeSeconds"].min()
     threshold = best_time * 1.05
     laps = laps[laps["LapTimeSeconds"] <= threshold]
     
-    laps["SessionMinute"] = (
-        laps["LapStartTime"] - session.session_start_time
-    ).dt.total_seconds() / 60
+    session_minute = (laps["LapStartTime"] - session.session_start_time).dt.total_seconds() / 60
+    window = np.floor(session_minute / window_minutes)
+    in_range = (session_minute >= 0) & (window * window_minutes < session_minute.max())
+    
+    metrics = {"LapTimeSeconds": "Lap"}
+    if by_sector:
+        metrics.update({f"Sector{sector}Seconds": f"Sector{sector}" for sector in [1, 2, 3]})
+    
+    group_columns = ["Compound"] if by_compound else []
+    windowed = laps.loc[in_range, group_columns + list(metrics)].assign(Window=window[in_range])
+    long_laps = windowed.melt(
+        id_vars=group_columns + ["Window"],
+        value_vars=list(metrics),
+        var_name="Metric",
+        value_name="Time",
+    )
+    long_laps["Metric"] = long_laps["Metric"].map(metrics)
     
-    best_per_window = []
-    max_minute = laps["SessionMinute"].max()
+    fit_keys = group_columns + ["Metric"]
+    evolution_df = long_laps.groupby(fit_keys + ["Window"], observed=True).agg(
+        BestTime=("Time", "min"),
+        LapCount=("Time", "count"),
+    ).reset_index()
+    evolution_df = evolution_df[evolution_df["LapCount"] >= min_laps_per_window]
+    evolution_df.insert(len(fit_keys), "WindowStart", evolution_df.pop("Window") * window_minutes)
+    evolution_df.insert(len(fit_keys) + 1, "WindowMid", evolution_df["WindowStart"] + window_minutes / 2)
     
-    for window_start in np.arange(0, max_minute, TRACK_EVOLUTION_WINDOW_MINUTES):
-        window_end = window_start + TRACK_EVOLUTION_WINDOW_MINUTES
-        window_laps = laps[
-            (laps["SessionMinute"] >= window_start) &
-            (laps["SessionMinute"] < window_end)
-        ]
-        
-        if len(window_laps) >= 3:
-            best_time = window_laps["LapTimeSeconds"].min()
-            best_per_window.append({
-                "WindowStart": window_start,
-                "WindowMid": window_start + TRACK_EVOLUTION_WINDOW_MINUTES / 2,
-                "BestTime": best_time,
-                "LapCount": len(window_laps),
-            })
-    
-    evolution_df = pd.DataFrame(best_per_window)
-    
-    if len(evolution_df) >= 3:
-        x = evolution_df["WindowMid"].values
-        y = evolution_df["BestTime"].values
-        slope, intercept, r_value, p_value, std_err = stats.linregress(x, y)
-        
-        if abs(slope) > 0.05:
-            slope = 0.05 if slope > 0 else -0.05
-        
-        evolution_df["FittedTime"] = intercept + slope * evolution_df["WindowMid"]
-        evolution_df["EvolutionRate"] = slope
-        evolution_df["RSquared"] = r_value ** 2
+    window_counts = evolution_df.groupby(fit_keys, observed=True)["BestTime"].transform("count")
+    fittable = evolution_df[window_counts >= min_windows_for_fit]
+    
+    if fittable.empty:
+        fits = None
+    elif fit is None:
+        fits = fit_grouped_trends(fittable, "BestTime", fit_keys, x_column="WindowMid")
+    else:
+        fits = fittable.groupby(fit_keys, observed=True)[["WindowMid", "BestTime"]].apply(
+            lambda group: pd.Series(
+                fit(group["WindowMid"].to_numpy(), group["BestTime"].to_numpy()),
+                index=["Slope", "Intercept", "RSquared"],
+            )
+        )
+    
+    if fits is None:
+        evolution_df = evolution_df.assign(Slope=np.nan, Intercept=np.nan, RSquared=np.nan)
     else:
-        evolution_df["FittedTime"] = evolution_df["BestTime"] if not evolution_df.empty else []
-        evolution_df["EvolutionRate"] = 0
-        evolution_df["RSquared"] = 0
+        fits["Slope"] = fits["Slope"].clip(-config.max_track_evolution_rate, config.max_track_evolution_rate)
+        evolution_df = evolution_df.join(fits[["Slope", "Intercept", "RSquared"]], on=fit_keys)
+    
+    evolution_df["FittedTime"] = (
+        evolution_df["Intercept"] + evolution_df["Slope"] * evolution_df["WindowMid"]
+    ).fillna(evolution_df["BestTime"])
+    evolution_df["EvolutionRate"] = evolution_df.pop("Slope").fillna(0)
+    evolution_df["RSquared"] = evolution_df.pop("RSquared").fillna(0)
     
-    return evolution_df
+    return evolution_df.drop(columns="Intercept").reset_index(drop=True)
+
+
+def calculate_track_evolution_model(
+    session,
+    window_minutes: Optional[float] = None,
+    fit: Optional[Callable[[np.ndarray, np.ndarray], Tuple[float, float, float]]] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    evolution_df = calculate_track_evolution_breakdown(
+        session,
+        window_minutes,
+        by_compound=False,
+        by_sector=False,
+        fit=fit,
+        config=config,
+    )
+    return evolution_df.drop(columns="Metric")
 
 
 def add_track_evolution_correction(laps: pd.DataFrame, evolution_model: pd.DataFrame) -> pd.DataFrame:
     laps = laps.copy()
     
     if evolution_model.empty or "EvolutionRate" not in evolution_model.columns:
-        laps["TrackEvolutionCorrection"] = 0
+        laps["TrackEvolutionCorrection"] = np.float32(0)
         laps["EvolutionCorrectedTime"] = laps["LapTimeSeconds"]
         return laps
     
@@ -142,45 +194,76 @@ def add_track_evolution_correction(laps: pd.DataFrame, evolution_model: pd.DataF
     
     laps["TrackEvolutionCorrection"] = (
         (laps["SessionMinute"] - session_midpoint) * evolution_rate * -1
-    )
+    ).astype("float32")
     laps["EvolutionCorrectedTime"] = laps["LapTimeSeconds"] + laps["TrackEvolutionCorrection"]
     
     return laps
 
 
-def calculate_empirical_degradation(laps: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+def fit_grouped_trends(
+    laps: pd.DataFrame,
+    y_column: str,
+    group_columns: Tuple[str, ...] = ("Driver", "Session", "StintNumber"),
+    x_column: str = "TyreLap",
+) -> pd.DataFrame:
+    keys = list(group_columns)
+    data = laps[keys + [x_column, y_column]].dropna(subset=[x_column, y_column])
+    
+    x = data[x_column].astype(float)
+    y = data[y_column].astype(float)
+    grouped = data.groupby(keys, sort=False, observed=True)
+    dx = x - grouped[x_column].transform("mean")
+    dy = y - grouped[y_column].transform("mean")
+    
+    moments = data[keys].assign(
+        N=1,
+        SumX=x,
+        SumY=y,
+        Sxx=dx * dx,
+        Sxy=dx * dy,
+        Syy=dy * dy,
+    ).groupby(keys, sort=False, observed=True).sum()
+    return trend_fits_from_moments(moments)
+
+
+def trend_fits_from_moments(moments: pd.DataFrame, prefix: str = "") -> pd.DataFrame:
+    n = moments[f"{prefix}N"]
+    sxx = moments[f"{prefix}Sxx"]
+    sxy = moments[f"{prefix}Sxy"]
+    syy = moments[f"{prefix}Syy"]
+    
+    slope = sxy / sxx.where(sxx > 0)
+    intercept = moments[f"{prefix}SumY"] / n - slope * moments[f"{prefix}SumX"] / n
+    ss_res = (syy - slope * sxy).clip(lower=0)
+    r_squared = (1 - ss_res / syy.where(syy > 0)).fillna(0)
+    residual_std = np.sqrt(ss_res / (n - 2).where(n > 2))
+    
+    return pd.DataFrame({
+        "Slope": slope,
+        "Intercept": intercept,
+        "RSquared": r_squared,
+        "ResidualStd": residual_std,
+        "N": n,
+    }).where(n > 0)
+
+
+def calculate_empirical_degradation(laps: pd.DataFrame, config: RunConfig = DEFAULT_RUN_CONFIG) -> Dict[str, Dict[str, float]]:
     laps = laps.copy()
     
     if "TyreLap" not in laps.columns:
         laps = add_stint_info(laps)
     
-    laps = add_fuel_corrected_times(laps)
+    laps = add_fuel_corrected_times(laps, config)
+    
+    fits = fit_grouped_trends(laps, "FuelCorrectedTime", ("Compound", "Driver", "StintNumber"))
+    fits = fits[(fits["N"] >= config.min_laps_for_degradation) & (fits["Slope"] > 0) & (fits["Slope"] < 0.3)]
+    slopes_by_compound = fits.groupby(level="Compound", observed=True)["Slope"]
     
     deg_by_compound = {}
     
     for compound in laps["Compound"].unique():
-        compound_laps = laps[laps["Compound"] == compound]
-        stint_slopes = []
-        
-        for driver in compound_laps["Driver"].unique():
-            driver_compound = compound_laps[compound_laps["Driver"] == driver]
-            
-            for stint in driver_compound["StintNumber"].unique():
-                stint_laps = driver_compound[driver_compound["StintNumber"] == stint]
-                stint_laps = stint_laps.sort_values("TyreLap")
-                
-                if len(stint_laps) < MIN_LAPS_FOR_DEGRADATION:
-                    continue
-                
-                x = stint_laps["TyreLap"].values
-                y = stint_laps["FuelCorrectedTime"].values
-                
-                slope, _ = np.polyfit(x, y, 1)
-                
-                if 0 < slope < 0.3:
-                    stint_slopes.append(slope)
-        
-        if stint_slopes:
+        if compound in slopes_by_compound.groups:
+            stint_slopes = slopes_by_compound.get_group(compound).to_numpy()
             deg_by_compound[compound] = {
                 "median": np.median(stint_slopes),
                 "mean": np.mean(stint_slopes),
@@ -189,8 +272,8 @@ def calculate_empirical_degradation(laps: pd.DataFrame) -> Dict[str, Dict[str, f
             }
         else:
             deg_by_compound[compound] = {
-                "median": TIRE_DEGRADATION_ESTIMATES.get(compound, 0.05),
-                "mean": TIRE_DEGRADATION_ESTIMATES.get(compound, 0.05),
+                "median": config.tire_degradation_estimates.get(compound, 0.05),
+                "mean": config.tire_degradation_estimates.get(compound, 0.05),
                 "std": 0,
                 "n_stints": 0,
             }
@@ -198,9 +281,23 @@ def calculate_empirical_degradation(laps: pd.DataFrame) -> Dict[str, Dict[str, f
     return deg_by_compound
 
 
+def degradation_rates(
+    compounds: pd.Series,
+    empirical_deg: Dict[str, Dict[str, float]],
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Dict[str, float]:
+    deg_rates = {
+        compound: config.tire_degradation_estimates.get(compound, 0.05)
+        for compound in compounds.dropna().unique()
+    }
+    deg_rates.update({compound: deg_stats["median"] for compound, deg_stats in empirical_deg.items()})
+    return deg_rates
+
+
 def add_tyre_age_correction(
     laps: pd.DataFrame,
     empirical_deg: Optional[Dict[str, Dict[str, float]]] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
     laps = laps.copy()
     
@@ -208,22 +305,12 @@ def add_tyre_age_correction(
         laps = add_stint_info(laps)
     
     if empirical_deg is None:
-        empirical_deg = calculate_empirical_degradation(laps)
+        empirical_deg = calculate_empirical_degradation(laps, config)
     
     median_tyre_lap = laps["TyreLap"].median()
+    deg_rate = laps["Compound"].map(degradation_rates(laps["Compound"], empirical_deg, config)).astype(float).fillna(0.05)
     
-    def calc_tyre_correction(row):
-        compound = row["Compound"]
-        tyre_lap = row["TyreLap"]
-        
-        if compound in empirical_deg:
-            deg_rate = empirical_deg[compound]["median"]
-        else:
-            deg_rate = TIRE_DEGRADATION_ESTIMATES.get(compound, 0.05)
-        
-        return (tyre_lap - median_tyre_lap) * deg_rate * -1
-    
-    laps["TyreAgeCorrection"] = laps.apply(calc_tyre_correction, axis=1)
+    laps["TyreAgeCorrection"] = ((laps["TyreLap"] - median_tyre_lap) * deg_rate * -1).astype("float32")
     laps["TyreCorrectedTime"] = laps["LapTimeSeconds"] + laps["TyreAgeCorrection"]
     
     return laps
@@ -233,15 +320,25 @@ def add_fully_corrected_times(
     laps: pd.DataFrame,
     evolution_model: pd.DataFrame,
     empirical_deg: Optional[Dict[str, Dict[str, float]]] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
     laps = add_stint_info(laps)
-    laps = add_fuel_corrected_times(laps)
+    laps = add_fuel_corrected_times(laps, config)
+    return add_evolution_and_tyre_corrections(laps, evolution_model, empirical_deg, config)
+
+
+def add_evolution_and_tyre_corrections(
+    laps: pd.DataFrame,
+    evolution_model: pd.DataFrame,
+    empirical_deg: Optional[Dict[str, Dict[str, float]]] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
     laps = add_track_evolution_correction(laps, evolution_model)
     
     if empirical_deg is None:
-        empirical_deg = calculate_empirical_degradation(laps)
+        empirical_deg = calculate_empirical_degradation(laps, config)
     
-    laps = add_tyre_age_correction(laps, empirical_deg)
+    laps = add_tyre_age_correction(laps, empirical_deg, config)
     
     laps["FullyCorrectedTime"] = (
         laps["LapTimeSeconds"] +
@@ -253,73 +350,235 @@ def add_fully_corrected_times(
     return laps
 
 
-def filter_representative_laps(laps: pd.DataFrame) -> pd.DataFrame:
+def filter_representative_laps(laps: pd.DataFrame, config: RunConfig = DEFAULT_RUN_CONFIG) -> pd.DataFrame:
     laps = laps.copy()
     best_time = laps["LapTimeSeconds"].min()
-    threshold = best_time * (OUTLIER_THRESHOLD_PERCENT / 100)
+    threshold = best_time * (config.outlier_threshold_percent / 100)
     return laps[laps["LapTimeSeconds"] <= threshold]
 
 
+class PreparedSession:
+    def __init__(self, session, name: Optional[str] = None, config: RunConfig = DEFAULT_RUN_CONFIG):
+        self.session = session
+        self.name = name if name is not None else getattr(session, "name", None)
+        self.config = config
+        self._corrected_laps = []
+        self._stint_summaries = []
+    
+    @property
+    def session_start_time(self) -> pd.Timedelta:
+        return self.session.session_start_time
+    
+    @cached_property
+    def base_laps(self) -> pd.DataFrame:
+        return get_lap_data(self.session, self.config)
+    
+    @cached_property
+    def drivers(self) -> pd.DataFrame:
+        return get_driver_info(self.session)
+    
+    @cached_property
+    def stint_laps(self) -> pd.DataFrame:
+        return add_stint_info(self.base_laps)
+    
+    @cached_property
+    def fuel_corrected_laps(self) -> pd.DataFrame:
+        return add_fuel_corrected_times(self.stint_laps, self.config)
+    
+    @cached_property
+    def representative_laps(self) -> pd.DataFrame:
+        return filter_representative_laps(self.fuel_corrected_laps, self.config)
+    
+    @cached_property
+    def empirical_degradation(self) -> Dict[str, Dict[str, float]]:
+        return calculate_empirical_degradation(self.fuel_corrected_laps, self.config)
+    
+    def stint_summary(self, evolution_model: pd.DataFrame) -> pd.DataFrame:
+        for cached_model, summary in self._stint_summaries:
+            if cached_model is evolution_model:
+                return summary
+        
+        summary = summarize_stints(self.fully_corrected_laps(evolution_model, representative=True), config=self.config)
+        self._stint_summaries.append((evolution_model, summary))
+        return summary
+    
+    def fully_corrected_laps(
+        self,
+        evolution_model: pd.DataFrame,
+        empirical_deg: Optional[Dict[str, Dict[str, float]]] = None,
+        representative: bool = False,
+    ) -> pd.DataFrame:
+        if empirical_deg is None:
+            empirical_deg = self.empirical_degradation
+        
+        for cached_model, cached_deg, cached_representative, laps in self._corrected_laps:
+            if (
+                cached_model is evolution_model and
+                cached_deg is empirical_deg and
+                cached_representative == representative
+            ):
+                return laps
+        
+        if representative:
+            laps = filter_representative_laps(self.fully_corrected_laps(evolution_model, empirical_deg), self.config)
+        else:
+            laps = add_evolution_and_tyre_corrections(
+                self.fuel_corrected_laps, evolution_model, empirical_deg, self.config
+            )
+        
+        self._corrected_laps.append((evolution_model, empirical_deg, representative, laps))
+        return laps
+
+
+def as_prepared_session(session, config: Optional[RunConfig] = None) -> PreparedSession:
+    if isinstance(session, PreparedSession):
+        if config is None or session.config == config:
+            return session
+        return PreparedSession(session.session, session.name, config)
+    return PreparedSession(session, config=config if config is not None else DEFAULT_RUN_CONFIG)
+
+
+def driver_name(driver: str, names: Dict[str, str], config: RunConfig = DEFAULT_RUN_CONFIG) -> str:
+    if driver in names:
+        return names[driver]
+    return config.driver_full_names.get(driver, driver)
+
+
+def build_pairing_table(
+    mode: Optional[str] = None,
+    subject_drivers: Optional[List[str]] = None,
+    reference_drivers: Optional[List[str]] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    mode = mode if mode is not None else config.pairing_mode
+    if mode == "teammate":
+        pairs = list(config.driver_rookie_mapping.items())
+    elif mode == "rookie-vs-field":
+        references = reference_drivers if reference_drivers is not None else list(config.regular_drivers)
+        pairs = [
+            (regular, rookie)
+            for rookie in config.rookie_drivers
+            for regular in references
+            if regular != rookie
+        ]
+    elif mode == "all-vs-all":
+        subjects = subject_drivers if subject_drivers is not None else list(config.driver_full_names)
+        references = reference_drivers if reference_drivers is not None else list(config.driver_full_names)
+        pairs = [
+            (regular, rookie)
+            for rookie in subjects
+            for regular in references
+            if regular != rookie
+        ]
+    else:
+        available = ", ".join(PAIRING_MODES)
+        raise ValueError(f"Unknown pairing mode '{mode}' (available: {available})")
+    
+    return pd.DataFrame(pairs, columns=["Regular", "Rookie"])
+
+
+def pair_driver_aggregates(
+    subject_laps: pd.DataFrame,
+    reference_laps: pd.DataFrame,
+    aggregations: Dict[str, Tuple[str, str]],
+    pairing=None,
+    keys: Tuple[str, ...] = ("Compound",),
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    if isinstance(pairing, pd.DataFrame):
+        pairs = pairing[["Regular", "Rookie"]]
+    else:
+        pairs = build_pairing_table(
+            pairing,
+            subject_drivers=list(subject_laps["Driver"].unique()),
+            reference_drivers=list(reference_laps["Driver"].unique()),
+            config=config,
+        )
+    
+    group_keys = ["Driver"] + list(keys)
+    subject = subject_laps.groupby(group_keys, sort=False, observed=True).agg(
+        **{f"Rookie{name}": spec for name, spec in aggregations.items()}
+    ).reset_index().rename(columns={"Driver": "Rookie"})
+    reference = reference_laps.groupby(group_keys, sort=False, observed=True).agg(
+        **{f"Regular{name}": spec for name, spec in aggregations.items()}
+    ).reset_index().rename(columns={"Driver": "Regular"})
+    
+    paired = pairs.merge(subject, on="Rookie").merge(reference, on=["Regular"] + list(keys))
+    
+    paired.insert(1, "RegularName", paired["Regular"].map(lambda x: driver_name(x, config.regular_full_names, config)))
+    paired.insert(3, "RookieName", paired["Rookie"].map(lambda x: driver_name(x, config.rookie_full_names, config)))
+    paired.insert(4, "Team", paired["Rookie"].map(lambda x: config.team_mapping.get(x, "Unknown")))
+    
+    return paired
+
+
 def calculate_compound_matched_pace(
     fp1_session,
     fp2_session,
     fp1_evolution: pd.DataFrame,
     fp2_evolution: pd.DataFrame,
+    pairing=None,
+    bootstrap: bool = False,
+    n_resamples: Optional[int] = None,
+    seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
-    fp1_laps = get_lap_data(fp1_session)
-    fp1_laps = add_stint_info(fp1_laps)
-    fp1_laps = add_fuel_corrected_times(fp1_laps)
-    fp1_laps = filter_representative_laps(fp1_laps)
+    fp1_laps = as_prepared_session(fp1_session, config).representative_laps
+    fp2_laps = as_prepared_session(fp2_session, config).representative_laps
+    
+    paired = pair_driver_aggregates(
+        fp1_laps,
+        fp2_laps,
+        {
+            "BestRaw": ("LapTimeSeconds", "min"),
+            "BestCorrected": ("FuelCorrectedTime", "min"),
+            "LapCount": ("LapTimeSeconds", "size"),
+        },
+        pairing,
+        config=config,
+    )
     
-    fp2_laps = get_lap_data(fp2_session)
-    fp2_laps = add_stint_info(fp2_laps)
-    fp2_laps = add_fuel_corrected_times(fp2_laps)
-    fp2_laps = filter_representative_laps(fp2_laps)
+    if paired.empty:
+        return pd.DataFrame()
     
-    results = []
+    paired["RawDeficit"] = paired["RookieBestRaw"] - paired["RegularBestRaw"]
+    paired["CorrectedDeficit"] = paired["RookieBestCorrected"] - paired["RegularBestCorrected"]
+    
+    columns = [
+        "Regular",
+        "RegularName",
+        "Rookie",
+        "RookieName",
+        "Team",
+        "Compound",
+        "RegularBestRaw",
+        "RookieBestRaw",
+        "RawDeficit",
+        "RegularBestCorrected",
+        "RookieBestCorrected",
+        "CorrectedDeficit",
+        "RegularLapCount",
+        "RookieLapCount",
+    ]
+    
+    if bootstrap:
+        intervals = bootstrap_pair_deficits(
+            paired,
+            fp1_laps,
+            fp2_laps,
+            "FuelCorrectedTime",
+            statistic="min",
+            n_resamples=n_resamples if n_resamples is not None else config.bootstrap_resamples,
+            seed=seed if seed is not None else config.bootstrap_seed,
+            confidence=config.bootstrap_confidence,
+            n_workers=n_workers if n_workers is not None else config.bootstrap_workers,
+        )
+        paired["CorrectedDeficitLo"] = intervals["Lo"]
+        paired["CorrectedDeficitHi"] = intervals["Hi"]
+        columns += ["CorrectedDeficitLo", "CorrectedDeficitHi"]
     
-    for regular, rookie in DRIVER_ROOKIE_MAPPING.items():
-        rookie_laps = fp1_laps[fp1_laps["Driver"] == rookie]
-        regular_laps = fp2_laps[fp2_laps["Driver"] == regular]
-        
-        if rookie_laps.empty or regular_laps.empty:
-            continue
-        
-        common_compounds = set(rookie_laps["Compound"].unique()) & set(regular_laps["Compound"].unique())
-        
-        for compound in common_compounds:
-            rook_compound = rookie_laps[rookie_laps["Compound"] == compound]
-            reg_compound = regular_laps[regular_laps["Compound"] == compound]
-            
-            if rook_compound.empty or reg_compound.empty:
-                continue
-            
-            reg_best_raw = reg_compound["LapTimeSeconds"].min()
-            rook_best_raw = rook_compound["LapTimeSeconds"].min()
-            raw_deficit = rook_best_raw - reg_best_raw
-            
-            reg_best_fuel_corrected = reg_compound["FuelCorrectedTime"].min()
-            rook_best_fuel_corrected = rook_compound["FuelCorrectedTime"].min()
-            corrected_deficit = rook_best_fuel_corrected - reg_best_fuel_corrected
-            
-            results.append({
-                "Regular": regular,
-                "RegularName": REGULAR_FULL_NAMES.get(regular, regular),
-                "Rookie": rookie,
-                "RookieName": ROOKIE_FULL_NAMES.get(rookie, rookie),
-                "Team": TEAM_MAPPING.get(rookie, "Unknown"),
-                "Compound": compound,
-                "RegularBestRaw": reg_best_raw,
-                "RookieBestRaw": rook_best_raw,
-                "RawDeficit": raw_deficit,
-                "RegularBestCorrected": reg_best_fuel_corrected,
-                "RookieBestCorrected": rook_best_fuel_corrected,
-                "CorrectedDeficit": corrected_deficit,
-                "RegularLapCount": len(reg_compound),
-                "RookieLapCount": len(rook_compound),
-            })
-    
-    return pd.DataFrame(results)
+    return paired[columns]
 
 
 def calculate_aggregate_pace_deficit(compound_pace_df: pd.DataFrame) -> pd.DataFrame:
@@ -347,13 +606,42 @@ def calculate_aggregate_pace_deficit(compound_pace_df: pd.DataFrame) -> pd.DataF
     return aggregated
 
 
-def calculate_stint_analysis(session, evolution_model: pd.DataFrame) -> pd.DataFrame:
-    laps = get_lap_data(session)
-    laps = add_fully_corrected_times(laps, evolution_model)
-    laps = filter_representative_laps(laps)
+def summarize_stints(
+    laps: pd.DataFrame,
+    group_columns: Tuple[str, ...] = ("Driver", "StintNumber"),
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    stint_keys = list(group_columns)
+    
+    tyre_lap = laps["TyreLap"].astype(float)
+    trend_columns = pd.DataFrame({
+        "RawX": tyre_lap.where(laps["LapTimeSeconds"].notna()),
+        "RawY": laps["LapTimeSeconds"].astype(float),
+        "FuelX": tyre_lap.where(laps["FuelCorrectedTime"].notna()),
+        "FuelY": laps["FuelCorrectedTime"].astype(float),
+    }, index=laps.index)
+    centred = trend_columns - trend_columns.groupby(
+        [laps[key] for key in stint_keys], sort=False, observed=True
+    ).transform("mean")
+    laps = laps.assign(
+        **trend_columns,
+        RawSxx=centred["RawX"] ** 2,
+        RawSxy=centred["RawX"] * centred["RawY"],
+        RawSyy=centred["RawY"] ** 2,
+        FuelSxx=centred["FuelX"] ** 2,
+        FuelSxy=centred["FuelX"] * centred["FuelY"],
+        FuelSyy=centred["FuelY"] ** 2,
+    )
+    
+    moment_aggregations = {
+        f"{fit}{moment}": (f"{fit}{column}", "count" if moment == "N" else "sum")
+        for fit in ("Raw", "Fuel")
+        for moment, column in (("N", "Y"), ("SumX", "X"), ("SumY", "Y"), ("Sxx", "Sxx"), ("Sxy", "Sxy"), ("Syy", "Syy"))
+    }
     
-    stint_stats = laps.groupby(["Driver", "StintNumber", "Compound"]).agg(
-        LapCount=("LapTime", "count"),
+    stint_stats = laps.groupby(stint_keys, sort=False, observed=True).agg(
+        Compound=("Compound", "first"),
+        LapCount=("LapTimeSeconds", "count"),
         TotalStintLaps=("TyreLap", "max"),
         BestLapRaw=("LapTimeSeconds", "min"),
         BestLapCorrected=("FullyCorrectedTime", "min"),
@@ -362,13 +650,69 @@ def calculate_stint_analysis(session, evolution_model: pd.DataFrame) -> pd.DataF
         StdLap=("LapTimeSeconds", "std"),
         FirstLapNumber=("LapNumber", "min"),
         LastLapNumber=("LapNumber", "max"),
-    ).reset_index()
+        **moment_aggregations,
+    )
     
-    stint_stats["IsRookie"] = stint_stats["Driver"].isin(ROOKIE_DRIVERS)
-    stint_stats["DriverName"] = stint_stats["Driver"].apply(
-        lambda x: ALL_DRIVER_NAMES.get(x, x)
+    raw_fits = trend_fits_from_moments(stint_stats, "Raw")
+    fuel_fits = trend_fits_from_moments(stint_stats, "Fuel")
+    stint_stats = stint_stats.drop(columns=list(moment_aggregations)).assign(
+        RawTrend=raw_fits["Slope"],
+        FuelCorrectedTrend=fuel_fits["Slope"],
+        InitialPace=raw_fits["Intercept"],
+        RSquared=raw_fits["RSquared"],
+        ResidualStd=raw_fits["ResidualStd"],
     )
-    stint_stats["Team"] = stint_stats["Driver"].map(TEAM_MAPPING)
+    
+    stint_stats = stint_stats.reset_index()
+    driver_names = config.driver_full_names
+    stint_stats.insert(1, "DriverName", stint_stats["Driver"].map(lambda x: driver_names.get(x, x)))
+    stint_stats.insert(2, "Team", stint_stats["Driver"].map(lambda x: config.team_mapping.get(x, "Unknown")))
+    stint_stats.insert(3, "IsRookie", stint_stats["Driver"].isin(config.rookie_drivers))
+    
+    return stint_stats
+
+
+def calculate_stint_summary(
+    sessions: Dict[str, object],
+    evolution_models: Dict[str, pd.DataFrame],
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    summaries = []
+    
+    for session_name, session in sessions.items():
+        summary = as_prepared_session(session, config).stint_summary(evolution_models[session_name])
+        summaries.append(summary.assign(Session=session_name))
+    
+    if not summaries:
+        return pd.DataFrame()
+    
+    stint_summary = pd.concat(summaries, ignore_index=True)
+    stint_summary.insert(0, "Session", stint_summary.pop("Session"))
+    return stint_summary
+
+
+def calculate_stint_analysis(session, evolution_model: pd.DataFrame, config: RunConfig = DEFAULT_RUN_CONFIG) -> pd.DataFrame:
+    stint_stats = as_prepared_session(session, config).stint_summary(evolution_model)
+    stint_stats = stint_stats[stint_stats["Compound"].notna()]
+    stint_stats = stint_stats.sort_values(["Driver", "StintNumber", "Compound"], kind="mergesort")
+    
+    stint_stats = stint_stats[[
+        "Driver",
+        "StintNumber",
+        "Compound",
+        "LapCount",
+        "TotalStintLaps",
+        "BestLapRaw",
+        "BestLapCorrected",
+        "AvgLapRaw",
+        "AvgLapCorrected",
+        "StdLap",
+        "FirstLapNumber",
+        "LastLapNumber",
+        "IsRookie",
+        "DriverName",
+    ]].reset_index(drop=True)
+    stint_stats["Team"] = stint_stats["Driver"].map(config.team_mapping)
     
     return stint_stats
 
@@ -378,104 +722,84 @@ def calculate_stint_pace_trend(
     fp2_session,
     fp1_evolution: pd.DataFrame,
     fp2_evolution: pd.DataFrame,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
-    fp1_laps = get_lap_data(fp1_session)
-    fp1_laps = add_stint_info(fp1_laps)
-    fp1_laps = add_fuel_corrected_times(fp1_laps)
-    fp1_laps = filter_representative_laps(fp1_laps)
-    fp1_laps["Session"] = "FP1"
+    stint_summary = calculate_stint_summary(
+        {"FP1": fp1_session, "FP2": fp2_session},
+        {"FP1": fp1_evolution, "FP2": fp2_evolution},
+        config,
+    )
     
-    fp2_laps = get_lap_data(fp2_session)
-    fp2_laps = add_stint_info(fp2_laps)
-    fp2_laps = add_fuel_corrected_times(fp2_laps)
-    fp2_laps = filter_representative_laps(fp2_laps)
-    fp2_laps["Session"] = "FP2"
+    if stint_summary.empty:
+        return pd.DataFrame()
     
-    all_laps = pd.concat([fp1_laps, fp2_laps], ignore_index=True)
+    trends = stint_summary[stint_summary["LapCount"] >= config.min_laps_for_degradation]
     
-    results = []
+    if trends.empty:
+        return pd.DataFrame()
     
-    for driver in all_laps["Driver"].unique():
-        driver_laps = all_laps[all_laps["Driver"] == driver]
-        
-        for stint in driver_laps["StintNumber"].unique():
-            stint_laps = driver_laps[driver_laps["StintNumber"] == stint].sort_values("TyreLap")
-            
-            if len(stint_laps) < MIN_LAPS_FOR_DEGRADATION:
-                continue
-            
-            compound = stint_laps["Compound"].iloc[0]
-            session = stint_laps["Session"].iloc[0]
-            
-            x = stint_laps["TyreLap"].values
-            y_raw = stint_laps["LapTimeSeconds"].values
-            y_fuel_corrected = stint_laps["FuelCorrectedTime"].values
-            
-            if len(x) >= 2:
-                slope_raw, intercept_raw = np.polyfit(x, y_raw, 1)
-                slope_fuel_corrected, intercept_fuel_corrected = np.polyfit(x, y_fuel_corrected, 1)
-                
-                y_pred = intercept_raw + slope_raw * x
-                ss_res = np.sum((y_raw - y_pred) ** 2)
-                ss_tot = np.sum((y_raw - np.mean(y_raw)) ** 2)
-                r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
-                
-                is_rookie = driver in ROOKIE_DRIVERS
-                name = ALL_DRIVER_NAMES.get(driver, driver)
-                
-                results.append({
-                    "Driver": driver,
-                    "DriverName": name,
-                    "Team": TEAM_MAPPING.get(driver, "Unknown"),
-                    "IsRookie": is_rookie,
-                    "Session": session,
-                    "StintNumber": stint,
-                    "Compound": compound,
-                    "LapCount": len(stint_laps),
-                    "RawTrend": slope_raw,
-                    "FuelCorrectedTrend": slope_fuel_corrected,
-                    "InitialPace": intercept_raw,
-                    "RSquared": r_squared,
-                })
-    
-    return pd.DataFrame(results)
-
-
-def calculate_tyre_management_score(stint_trend_df: pd.DataFrame) -> pd.DataFrame:
+    return trends[[
+        "Driver",
+        "DriverName",
+        "Team",
+        "IsRookie",
+        "Session",
+        "StintNumber",
+        "Compound",
+        "LapCount",
+        "RawTrend",
+        "FuelCorrectedTrend",
+        "InitialPace",
+        "RSquared",
+        "ResidualStd",
+    ]].reset_index(drop=True)
+
+
+def calculate_tyre_management_score(
+    stint_trend_df: pd.DataFrame,
+    weight_by_laps: Optional[bool] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
     if stint_trend_df.empty:
         return pd.DataFrame()
     
-    results = []
-    
-    for compound in stint_trend_df["Compound"].unique():
-        compound_data = stint_trend_df[stint_trend_df["Compound"] == compound]
-        
-        if compound_data.empty:
-            continue
-        
-        median_trend = compound_data["FuelCorrectedTrend"].median()
-        
-        for _, row in compound_data.iterrows():
-            trend_vs_median = row["FuelCorrectedTrend"] - median_trend
-            trend_percentile = stats.percentileofscore(
-                compound_data["FuelCorrectedTrend"].values,
-                row["FuelCorrectedTrend"]
-            )
-            tyre_score = 100 - trend_percentile
-            
-            results.append({
-                "Driver": row["Driver"],
-                "DriverName": row["DriverName"],
-                "Team": row["Team"],
-                "IsRookie": row["IsRookie"],
-                "Compound": compound,
-                "FuelCorrectedTrend": row["FuelCorrectedTrend"],
-                "MedianTrend": median_trend,
-                "TrendVsMedian": trend_vs_median,
-                "TyreManagementScore": tyre_score,
-            })
-    
-    return pd.DataFrame(results)
+    weight_by_laps = weight_by_laps if weight_by_laps is not None else config.tyre_score_weight_by_laps
+    
+    compound_order = pd.factorize(stint_trend_df["Compound"])[0]
+    scores = stint_trend_df.iloc[np.argsort(compound_order, kind="stable")]
+    scores = scores[scores["Compound"].notna()]
+    by_compound = scores.groupby("Compound", sort=False, observed=True)["FuelCorrectedTrend"]
+    
+    median_trend = by_compound.transform("median")
+    
+    if weight_by_laps:
+        weights = scores["LapCount"].astype(float)
+        weight_keys = [scores["Compound"], scores["FuelCorrectedTrend"]]
+        tied_weight = weights.groupby(weight_keys, sort=False, observed=True).transform("sum")
+        sorted_scores = scores.assign(Weight=weights).sort_values(["Compound", "FuelCorrectedTrend"], kind="mergesort")
+        cumulative_weight = sorted_scores.groupby("Compound", observed=True)["Weight"].cumsum()
+        weight_at_or_below = cumulative_weight.groupby(
+            [sorted_scores["Compound"], sorted_scores["FuelCorrectedTrend"]], observed=True
+        ).transform("max").reindex(scores.index)
+        total_weight = weights.groupby(scores["Compound"], observed=True).transform("sum")
+        weight_below = weight_at_or_below - tied_weight
+        trend_percentile = (weight_below + weight_at_or_below + 1) * (50.0 / total_weight)
+    else:
+        ranks = by_compound.rank(method="average")
+        counts = by_compound.transform("count")
+        trend_percentile = (2 * ranks) * (50.0 / counts)
+    
+    return pd.DataFrame({
+        "Driver": scores["Driver"],
+        "DriverName": scores["DriverName"],
+        "Team": scores["Team"],
+        "IsRookie": scores["IsRookie"],
+        "Compound": scores["Compound"],
+        "FuelCorrectedTrend": scores["FuelCorrectedTrend"],
+        "MedianTrend": median_trend,
+        "TrendVsMedian": scores["FuelCorrectedTrend"] - median_trend,
+        "TyreManagementScore": 100 - trend_percentile,
+    }).reset_index(drop=True)
 
 
 def calculate_long_run_pace(
@@ -484,89 +808,128 @@ def calculate_long_run_pace(
     fp1_evolution: pd.DataFrame,
     fp2_evolution: pd.DataFrame,
     min_stint_length: int = 6,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
-    fp1_laps = get_lap_data(fp1_session)
-    fp1_laps = add_fully_corrected_times(fp1_laps, fp1_evolution)
-    fp1_laps = filter_representative_laps(fp1_laps)
+    stint_summary = calculate_stint_summary(
+        {"FP1": fp1_session, "FP2": fp2_session},
+        {"FP1": fp1_evolution, "FP2": fp2_evolution},
+        config,
+    )
     
-    fp2_laps = get_lap_data(fp2_session)
-    fp2_laps = add_fully_corrected_times(fp2_laps, fp2_evolution)
-    fp2_laps = filter_representative_laps(fp2_laps)
+    if stint_summary.empty:
+        return pd.DataFrame()
     
-    all_laps = pd.concat([fp1_laps, fp2_laps], ignore_index=True)
+    long_runs = stint_summary[stint_summary["LapCount"] >= min_stint_length]
     
-    results = []
+    if long_runs.empty:
+        return pd.DataFrame()
     
-    for driver in all_laps["Driver"].unique():
-        driver_laps = all_laps[all_laps["Driver"] == driver]
-        
-        for stint in driver_laps["StintNumber"].unique():
-            stint_laps = driver_laps[driver_laps["StintNumber"] == stint]
-            
-            if len(stint_laps) < min_stint_length:
-                continue
-            
-            compound = stint_laps["Compound"].iloc[0]
-            is_rookie = driver in ROOKIE_DRIVERS
-            name = ALL_DRIVER_NAMES.get(driver, driver)
-            
-            results.append({
-                "Driver": driver,
-                "DriverName": name,
-                "Team": TEAM_MAPPING.get(driver, "Unknown"),
-                "IsRookie": is_rookie,
-                "StintNumber": stint,
-                "Compound": compound,
-                "StintLength": len(stint_laps),
-                "AvgPaceRaw": stint_laps["LapTimeSeconds"].mean(),
-                "AvgPaceCorrected": stint_laps["FullyCorrectedTime"].mean(),
-                "BestLap": stint_laps["LapTimeSeconds"].min(),
-                "Consistency": stint_laps["LapTimeSeconds"].std(),
-            })
-    
-    return pd.DataFrame(results)
-
-
-def compare_long_run_pace(long_run_df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Driver": long_runs["Driver"],
+        "DriverName": long_runs["DriverName"],
+        "Team": long_runs["Team"],
+        "IsRookie": long_runs["IsRookie"],
+        "Session": long_runs["Session"],
+        "StintNumber": long_runs["StintNumber"],
+        "Compound": long_runs["Compound"],
+        "StintLength": long_runs["LapCount"],
+        "AvgPaceRaw": long_runs["AvgLapRaw"],
+        "AvgPaceCorrected": long_runs["AvgLapCorrected"],
+        "BestLap": long_runs["BestLapRaw"],
+        "Consistency": long_runs["StdLap"],
+    }).reset_index(drop=True)
+
+
+def get_long_run_laps(
+    fp1_session,
+    fp2_session,
+    fp1_evolution: pd.DataFrame,
+    fp2_evolution: pd.DataFrame,
+    min_stint_length: int = 6,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    long_runs = calculate_long_run_pace(
+        fp1_session, fp2_session, fp1_evolution, fp2_evolution, min_stint_length, config
+    )
+    
+    if long_runs.empty:
+        return pd.DataFrame()
+    
+    laps = pd.concat([
+        as_prepared_session(session, config).fully_corrected_laps(evolution_model, representative=True).assign(Session=name)
+        for name, session, evolution_model in [
+            ("FP1", fp1_session, fp1_evolution),
+            ("FP2", fp2_session, fp2_evolution),
+        ]
+    ], ignore_index=True)
+    
+    return laps.merge(long_runs[["Session", "Driver", "StintNumber"]], on=["Session", "Driver", "StintNumber"])
+
+
+def compare_long_run_pace(
+    long_run_df: pd.DataFrame,
+    pairing=None,
+    long_run_laps: Optional[pd.DataFrame] = None,
+    bootstrap: bool = False,
+    n_resamples: Optional[int] = None,
+    seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
     if long_run_df.empty:
         return pd.DataFrame()
     
-    results = []
+    paired = pair_driver_aggregates(
+        long_run_df,
+        long_run_df,
+        {
+            "LongRunPace": ("AvgPaceCorrected", "mean"),
+            "Consistency": ("Consistency", "mean"),
+        },
+        pairing,
+        config=config,
+    )
     
-    for regular, rookie in DRIVER_ROOKIE_MAPPING.items():
-        reg_runs = long_run_df[long_run_df["Driver"] == regular]
-        rook_runs = long_run_df[long_run_df["Driver"] == rookie]
-        
-        if reg_runs.empty or rook_runs.empty:
-            continue
-        
-        common_compounds = set(reg_runs["Compound"].unique()) & set(rook_runs["Compound"].unique())
+    if paired.empty:
+        return pd.DataFrame()
+    
+    paired["LongRunDeficit"] = paired["RookieLongRunPace"] - paired["RegularLongRunPace"]
+    
+    columns = [
+        "Regular",
+        "RegularName",
+        "Rookie",
+        "RookieName",
+        "Team",
+        "Compound",
+        "RegularLongRunPace",
+        "RookieLongRunPace",
+        "LongRunDeficit",
+        "RegularConsistency",
+        "RookieConsistency",
+    ]
+    
+    if bootstrap:
+        if long_run_laps is None:
+            raise ValueError("long_run_laps is required to bootstrap long run deficits")
         
-        for compound in common_compounds:
-            reg_compound = reg_runs[reg_runs["Compound"] == compound]
-            rook_compound = rook_runs[rook_runs["Compound"] == compound]
-            
-            if reg_compound.empty or rook_compound.empty:
-                continue
-            
-            reg_avg = reg_compound["AvgPaceCorrected"].mean()
-            rook_avg = rook_compound["AvgPaceCorrected"].mean()
-            
-            results.append({
-                "Regular": regular,
-                "RegularName": REGULAR_FULL_NAMES.get(regular, regular),
-                "Rookie": rookie,
-                "RookieName": ROOKIE_FULL_NAMES.get(rookie, rookie),
-                "Team": TEAM_MAPPING.get(rookie, "Unknown"),
-                "Compound": compound,
-                "RegularLongRunPace": reg_avg,
-                "RookieLongRunPace": rook_avg,
-                "LongRunDeficit": rook_avg - reg_avg,
-                "RegularConsistency": reg_compound["Consistency"].mean(),
-                "RookieConsistency": rook_compound["Consistency"].mean(),
-            })
-    
-    return pd.DataFrame(results)
+        intervals = bootstrap_pair_deficits(
+            paired,
+            long_run_laps,
+            long_run_laps,
+            "FullyCorrectedTime",
+            statistic="mean",
+            stint_columns=("Session", "StintNumber"),
+            n_resamples=n_resamples if n_resamples is not None else config.bootstrap_resamples,
+            seed=seed if seed is not None else config.bootstrap_seed,
+            confidence=config.bootstrap_confidence,
+            n_workers=n_workers if n_workers is not None else config.bootstrap_workers,
+        )
+        paired["LongRunDeficitLo"] = intervals["Lo"]
+        paired["LongRunDeficitHi"] = intervals["Hi"]
+        columns += ["LongRunDeficitLo", "LongRunDeficitHi"]
+    
+    return paired[columns]
 
 
 def calculate_advanced_sector_analysis(
@@ -574,59 +937,43 @@ def calculate_advanced_sector_analysis(
     fp2_session,
     fp1_evolution: pd.DataFrame,
     fp2_evolution: pd.DataFrame,
+    pairing=None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> pd.DataFrame:
-    fp1_laps = get_lap_data(fp1_session)
-    fp1_laps = add_stint_info(fp1_laps)
-    fp1_laps = add_fuel_corrected_times(fp1_laps)
-    fp1_laps = filter_representative_laps(fp1_laps)
+    fp1_laps = as_prepared_session(fp1_session, config).representative_laps
+    fp2_laps = as_prepared_session(fp2_session, config).representative_laps
     
-    fp2_laps = get_lap_data(fp2_session)
-    fp2_laps = add_stint_info(fp2_laps)
-    fp2_laps = add_fuel_corrected_times(fp2_laps)
-    fp2_laps = filter_representative_laps(fp2_laps)
+    aggregations = {}
+    for sector in [1, 2, 3]:
+        aggregations[f"Best{sector}"] = (f"Sector{sector}Seconds", "min")
+        aggregations[f"Avg{sector}"] = (f"Sector{sector}Seconds", "mean")
     
-    results = []
+    paired = pair_driver_aggregates(fp1_laps, fp2_laps, aggregations, pairing, config=config)
     
-    for regular, rookie in DRIVER_ROOKIE_MAPPING.items():
-        rookie_laps = fp1_laps[fp1_laps["Driver"] == rookie]
-        regular_laps = fp2_laps[fp2_laps["Driver"] == regular]
-        
-        if rookie_laps.empty or regular_laps.empty:
-            continue
-        
-        common_compounds = set(rookie_laps["Compound"].unique()) & set(regular_laps["Compound"].unique())
-        
-        for compound in common_compounds:
-            rook_compound = rookie_laps[rookie_laps["Compound"] == compound]
-            reg_compound = regular_laps[regular_laps["Compound"] == compound]
-            
-            for sector in [1, 2, 3]:
-                sector_col = f"Sector{sector}Seconds"
-                
-                reg_best = reg_compound[sector_col].min()
-                rook_best = rook_compound[sector_col].min()
-                deficit = rook_best - reg_best
-                
-                reg_avg = reg_compound[sector_col].mean()
-                rook_avg = rook_compound[sector_col].mean()
-                avg_deficit = rook_avg - reg_avg
-                
-                results.append({
-                    "Regular": regular,
-                    "Rookie": rookie,
-                    "RookieName": ROOKIE_FULL_NAMES.get(rookie, rookie),
-                    "Team": TEAM_MAPPING.get(rookie, "Unknown"),
-                    "Compound": compound,
-                    "Sector": sector,
-                    "RegularBest": reg_best,
-                    "RookieBest": rook_best,
-                    "BestDeficit": deficit,
-                    "RegularAvg": reg_avg,
-                    "RookieAvg": rook_avg,
-                    "AvgDeficit": avg_deficit,
-                })
-    
-    return pd.DataFrame(results)
+    if paired.empty:
+        return pd.DataFrame()
+    
+    sector_frames = []
+    for sector in [1, 2, 3]:
+        sector_frames.append(pd.DataFrame({
+            "PairRow": paired.index,
+            "Regular": paired["Regular"],
+            "Rookie": paired["Rookie"],
+            "RookieName": paired["RookieName"],
+            "Team": paired["Team"],
+            "Compound": paired["Compound"],
+            "Sector": sector,
+            "RegularBest": paired[f"RegularBest{sector}"],
+            "RookieBest": paired[f"RookieBest{sector}"],
+            "BestDeficit": paired[f"RookieBest{sector}"] - paired[f"RegularBest{sector}"],
+            "RegularAvg": paired[f"RegularAvg{sector}"],
+            "RookieAvg": paired[f"RookieAvg{sector}"],
+            "AvgDeficit": paired[f"RookieAvg{sector}"] - paired[f"RegularAvg{sector}"],
+        }))
+    
+    results = pd.concat(sector_frames, ignore_index=True)
+    results = results.sort_values(["PairRow", "Sector"], kind="mergesort")
+    return results.drop(columns="PairRow").reset_index(drop=True)
 
 
 def generate_advanced_summary(
@@ -634,9 +981,10 @@ def generate_advanced_summary(
     aggregate_pace_df: pd.DataFrame,
     stint_trend_df: pd.DataFrame,
     long_run_comparison: pd.DataFrame,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> Dict:
     summary = {
-        "total_rookies": len(ROOKIE_DRIVERS),
+        "total_rookies": len(config.rookie_drivers),
         "rookies_with_data": 0,
         "compounds_analyzed": [],
         "avg_raw_deficit": None,
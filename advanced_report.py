@@ -3,15 +3,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict
 
-from config import (
-    OUTPUT_DIR,
-    YEAR,
-    GP_NAME,
-    ROOKIE_FULL_NAMES,
-    FUEL_EFFECT_PER_KG,
-    FUEL_CONSUMPTION_KG_PER_LAP,
-    ESTIMATED_START_FUEL_KG,
-)
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
 
 
 def format_deficit(val):
@@ -35,9 +27,10 @@ def generate_advanced_report(
     sector_analysis_df: pd.DataFrame,
     evolution_df: pd.DataFrame,
     summary: Dict,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
 ) -> str:
     report = []
-    report.append(f"# {YEAR} {GP_NAME} GP - FP1 Rookie Performance Analysis")
+    report.append(f"# {config.year} {config.gp_name} GP - FP1 Rookie Performance Analysis")
     report.append(f"\n*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n")
     
     report.append("---\n")
@@ -191,6 +184,41 @@ def generate_advanced_report(
                 f"{row['RegularConsistency']:.3f}s |"
             )
     
+    has_pace_intervals = "CorrectedDeficitLo" in compound_pace_df.columns
+    has_long_run_intervals = "LongRunDeficitLo" in long_run_comparison_df.columns
+    
+    if has_pace_intervals or has_long_run_intervals:
+        report.append("\n---\n")
+        report.append("## Deficit Confidence Intervals\n")
+        report.append(
+            f"{config.bootstrap_confidence:.0%} percentile intervals from {config.bootstrap_resamples} bootstrap resamples of each driver's laps. "
+            f"Long run intervals resample laps within each stint.\n"
+        )
+    
+    if has_pace_intervals:
+        report.append("\n### Corrected Best-Lap Deficit\n")
+        report.append("| Rookie | Team | Compound | Deficit | Interval |")
+        report.append("|--------|------|----------|---------|----------|")
+        
+        for _, row in compound_pace_df.sort_values("CorrectedDeficit").iterrows():
+            report.append(
+                f"| {row['RookieName']} | {row['Team']} | {row['Compound']} | "
+                f"{format_deficit(row['CorrectedDeficit'])} | "
+                f"{format_deficit(row['CorrectedDeficitLo'])} to {format_deficit(row['CorrectedDeficitHi'])} |"
+            )
+    
+    if has_long_run_intervals:
+        report.append("\n### Long Run Deficit\n")
+        report.append("| Rookie | Team | Compound | Deficit | Interval |")
+        report.append("|--------|------|----------|---------|----------|")
+        
+        for _, row in long_run_comparison_df.sort_values("LongRunDeficit").iterrows():
+            report.append(
+                f"| {row['RookieName']} | {row['Team']} | {row['Compound']} | "
+                f"{format_deficit(row['LongRunDeficit'])} | "
+                f"{format_deficit(row['LongRunDeficitLo'])} to {format_deficit(row['LongRunDeficitHi'])} |"
+            )
+    
     report.append("\n---\n")
     report.append("## Sector Analysis\n")
     
@@ -222,9 +250,9 @@ def generate_advanced_report(
     
     report.append(f"| Parameter | Value |")
     report.append(f"|-----------|-------|")
-    report.append(f"| Fuel Effect | {FUEL_EFFECT_PER_KG} s/kg |")
-    report.append(f"| Fuel Consumption | {FUEL_CONSUMPTION_KG_PER_LAP} kg/lap |")
-    report.append(f"| Estimated Start Fuel | {ESTIMATED_START_FUEL_KG} kg |")
+    report.append(f"| Fuel Effect | {config.fuel_effect_per_kg} s/kg |")
+    report.append(f"| Fuel Consumption | {config.fuel_consumption_kg_per_lap} kg/lap |")
+    report.append(f"| Estimated Start Fuel | {config.estimated_start_fuel_kg} kg |")
     
     report.append("\n### Limitations\n")
     report.append("- **Cross-session comparison**: Rookies ran in FP1, regulars in FP2. Track conditions, temperature, and grip levels differ between sessions. FP2 typically has more rubber/grip, which may artificially reduce rookie deficits.\n")
@@ -236,9 +264,9 @@ def generate_advanced_report(
     return "\n".join(report)
 
 
-def save_report(report_content: str) -> Path:
-    Path(OUTPUT_DIR).mkdir(exist_ok=True)
-    filepath = Path(OUTPUT_DIR) / "rookie_analysis_report.md"
+def save_report(report_content: str, config: RunConfig = DEFAULT_RUN_CONFIG) -> Path:
+    Path(config.output_dir).mkdir(exist_ok=True)
+    filepath = Path(config.output_dir) / "rookie_analysis_report.md"
     with open(filepath, "w") as f:
         f.write(report_content)
     return filepath
\ No newline at end of file
@@ -1,11 +1,21 @@
+import hashlib
+import inspect
+import json
+import os
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import seaborn as sns
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from functools import cached_property, wraps
 from pathlib import Path
+from typing import Callable, Dict, List, Tuple
 
-from config import TEAM_COLORS, OUTPUT_DIR, DRIVER_ROOKIE_MAPPING
+from config import TEAM_COLORS
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
 
 
 COMPOUND_COLORS = {
@@ -16,33 +26,74 @@ COMPOUND_COLORS = {
     "WET": "#00AEEF",
 }
 
+RENDER_CACHE_SCHEMA_VERSION = 1
+RENDER_MANIFEST = "render_manifest.json"
 
-def setup_style():
-    plt.style.use("seaborn-v0_8-darkgrid")
-    plt.rcParams["figure.figsize"] = (12, 8)
-    plt.rcParams["font.size"] = 10
-    plt.rcParams["axes.titlesize"] = 14
-    plt.rcParams["axes.labelsize"] = 12
-    plt.rcParams["figure.dpi"] = 150
-    plt.rcParams["savefig.dpi"] = 150
-    plt.rcParams["savefig.bbox"] = "tight"
-    plt.rcParams["axes.facecolor"] = "#1a1a2e"
-    plt.rcParams["figure.facecolor"] = "#1a1a2e"
-    plt.rcParams["text.color"] = "white"
-    plt.rcParams["axes.labelcolor"] = "white"
-    plt.rcParams["xtick.color"] = "white"
-    plt.rcParams["ytick.color"] = "white"
-    plt.rcParams["axes.edgecolor"] = "white"
-    plt.rcParams["grid.color"] = "#333366"
 
+@dataclass(frozen=True)
+class PlotTheme:
+    name: str
+    background: str
+    foreground: str
+    panel: str
+    dpi: int = 150
+    base_style: str = "seaborn-v0_8-darkgrid"
+    
+    @cached_property
+    def rc_params(self) -> Dict:
+        rc_params = dict(plt.style.library[self.base_style])
+        rc_params.update({
+            "figure.figsize": (12, 8),
+            "font.size": 10,
+            "axes.titlesize": 14,
+            "axes.labelsize": 12,
+            "figure.dpi": self.dpi,
+            "savefig.dpi": self.dpi,
+            "savefig.bbox": "tight",
+            "axes.facecolor": self.background,
+            "figure.facecolor": self.background,
+            "text.color": self.foreground,
+            "axes.labelcolor": self.foreground,
+            "xtick.color": self.foreground,
+            "ytick.color": self.foreground,
+            "axes.edgecolor": self.foreground,
+            "grid.color": self.panel,
+        })
+        return rc_params
+    
+    def context(self):
+        return plt.rc_context(self.rc_params)
 
-def ensure_output_dir():
-    Path(OUTPUT_DIR).mkdir(exist_ok=True)
 
+DARK_THEME = PlotTheme("dark", background="#1a1a2e", foreground="white", panel="#333366")
+LIGHT_THEME = PlotTheme("light", background="white", foreground="#222222", panel="#DDDDDD", base_style="seaborn-v0_8-whitegrid")
+PREVIEW_THEME = replace(DARK_THEME, name="preview", dpi=60)
+
+PLOT_THEMES = {theme.name: theme for theme in (DARK_THEME, LIGHT_THEME, PREVIEW_THEME)}
+
+
+def get_plot_theme(name: str) -> PlotTheme:
+    if name not in PLOT_THEMES:
+        available = ", ".join(PLOT_THEMES)
+        raise ValueError(f"Unknown plot theme '{name}' (available: {available})")
+    return PLOT_THEMES[name]
+
+
+def themed(plot_function: Callable) -> Callable:
+    @wraps(plot_function)
+    def plot_with_theme(*args, theme: PlotTheme = DARK_THEME, **kwargs):
+        with theme.context():
+            return plot_function(*args, theme=theme, **kwargs)
+    return plot_with_theme
+
+
+def ensure_output_dir(config: RunConfig = DEFAULT_RUN_CONFIG):
+    Path(config.output_dir).mkdir(exist_ok=True)
+
+
+@themed
+def plot_compound_matched_pace(compound_pace_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
 
-def plot_compound_matched_pace(compound_pace_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
-    
     compounds = compound_pace_df["Compound"].unique()
     n_compounds = len(compounds)
     
@@ -56,25 +107,25 @@ def plot_compound_matched_pace(compound_pace_df: pd.DataFrame, session_name: str
         colors = [TEAM_COLORS.get(team, "#888888") for team in compound_data["Team"]]
         
         y_pos = np.arange(len(compound_data))
-        ax.barh(y_pos, compound_data["CorrectedDeficit"], color=colors, edgecolor="white", linewidth=0.5)
+        ax.barh(y_pos, compound_data["CorrectedDeficit"], color=colors, edgecolor=theme.foreground, linewidth=0.5)
         
         ax.set_yticks(y_pos)
         ax.set_yticklabels(compound_data["RookieName"])
         ax.set_xlabel("Corrected Deficit (seconds)")
-        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, "white"), fontweight="bold")
-        ax.axvline(x=0, color="white", linestyle="-", linewidth=0.5)
+        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, theme.foreground), fontweight="bold")
+        ax.axvline(x=0, color=theme.foreground, linestyle="-", linewidth=0.5)
         
         for i, (deficit, raw) in enumerate(zip(compound_data["CorrectedDeficit"], compound_data["RawDeficit"])):
             label = f"+{deficit:.3f}s (raw: +{raw:.3f}s)"
-            ax.text(deficit + 0.02, i, label, va="center", fontsize=8, color="white")
+            ax.text(deficit + 0.02, i, label, va="center", fontsize=8, color=theme.foreground)
     
     fig.suptitle(f"Compound-Matched Pace Deficit (Fuel/Track/Tyre Corrected) - {session_name}", fontsize=14, y=1.02)
     plt.tight_layout()
     return fig
 
 
-def plot_aggregate_pace_comparison(aggregate_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
+@themed
+def plot_aggregate_pace_comparison(aggregate_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
     fig, axes = plt.subplots(1, 2, figsize=(14, 8))
     
     aggregate_df = aggregate_df.sort_values("AvgCorrectedDeficit")
@@ -82,8 +133,8 @@ def plot_aggregate_pace_comparison(aggregate_df: pd.DataFrame, session_name: str
     
     ax1 = axes[0]
     y_pos = np.arange(len(aggregate_df))
-    ax1.barh(y_pos, aggregate_df["AvgRawDeficit"], color=colors, alpha=0.5, label="Raw", edgecolor="white")
-    ax1.barh(y_pos, aggregate_df["AvgCorrectedDeficit"], color=colors, alpha=0.9, label="Corrected", edgecolor="white", linewidth=0.5)
+    ax1.barh(y_pos, aggregate_df["AvgRawDeficit"], color=colors, alpha=0.5, label="Raw", edgecolor=theme.foreground)
+    ax1.barh(y_pos, aggregate_df["AvgCorrectedDeficit"], color=colors, alpha=0.9, label="Corrected", edgecolor=theme.foreground, linewidth=0.5)
     ax1.set_yticks(y_pos)
     ax1.set_yticklabels(aggregate_df["RookieName"])
     ax1.set_xlabel("Average Deficit (seconds)")
@@ -91,26 +142,26 @@ def plot_aggregate_pace_comparison(aggregate_df: pd.DataFrame, session_name: str
     ax1.legend()
     
     for i, (raw, corr) in enumerate(zip(aggregate_df["AvgRawDeficit"], aggregate_df["AvgCorrectedDeficit"])):
-        ax1.text(max(raw, corr) + 0.02, i, f"Δ{abs(raw-corr):.3f}s", va="center", fontsize=8, color="white")
+        ax1.text(max(raw, corr) + 0.02, i, f"Δ{abs(raw-corr):.3f}s", va="center", fontsize=8, color=theme.foreground)
     
     ax2 = axes[1]
-    ax2.barh(y_pos, aggregate_df["DeficitPercent"], color=colors, edgecolor="white", linewidth=0.5)
+    ax2.barh(y_pos, aggregate_df["DeficitPercent"], color=colors, edgecolor=theme.foreground, linewidth=0.5)
     ax2.set_yticks(y_pos)
     ax2.set_yticklabels(aggregate_df["RookieName"])
     ax2.set_xlabel("Deficit (%)")
     ax2.set_title("Percentage Deficit to Teammate")
     
     for i, pct in enumerate(aggregate_df["DeficitPercent"]):
-        ax2.text(pct + 0.02, i, f"+{pct:.2f}%", va="center", fontsize=9, color="white")
+        ax2.text(pct + 0.02, i, f"+{pct:.2f}%", va="center", fontsize=9, color=theme.foreground)
     
     fig.suptitle(f"Aggregate Pace Analysis - {session_name}", fontsize=14, y=1.02)
     plt.tight_layout()
     return fig
 
 
-def plot_stint_degradation(stint_trend_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
-    
+@themed
+def plot_stint_degradation(stint_trend_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
     compounds = stint_trend_df["Compound"].unique()
     fig, axes = plt.subplots(1, len(compounds), figsize=(7 * len(compounds), 8), squeeze=False)
     axes = axes.flatten()
@@ -127,16 +178,16 @@ def plot_stint_degradation(stint_trend_df: pd.DataFrame, session_name: str) -> p
         colors = ["#E74C3C" if r else "#3498DB" for r in compound_data["IsRookie"]]
         
         y_pos = np.arange(len(compound_data))
-        ax.barh(y_pos, compound_data["FuelCorrectedTrend"], color=colors, edgecolor="white", linewidth=0.5)
+        ax.barh(y_pos, compound_data["FuelCorrectedTrend"], color=colors, edgecolor=theme.foreground, linewidth=0.5)
         
         ax.set_yticks(y_pos)
         ax.set_yticklabels(compound_data["DriverName"])
         ax.set_xlabel("Lap Time Trend (sec/lap)")
-        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, "white"), fontweight="bold")
-        ax.axvline(x=0, color="white", linestyle="--", linewidth=0.5)
+        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, theme.foreground), fontweight="bold")
+        ax.axvline(x=0, color=theme.foreground, linestyle="--", linewidth=0.5)
         
         for i, (trend, r2) in enumerate(zip(compound_data["FuelCorrectedTrend"], compound_data["RSquared"])):
-            ax.text(trend + 0.002, i, f"{trend:.3f} (R²={r2:.2f})", va="center", fontsize=8, color="white")
+            ax.text(trend + 0.002, i, f"{trend:.3f} (R²={r2:.2f})", va="center", fontsize=8, color=theme.foreground)
     
     rookie_patch = mpatches.Patch(color="#E74C3C", label="Rookie")
     regular_patch = mpatches.Patch(color="#3498DB", label="Regular Driver")
@@ -147,14 +198,14 @@ def plot_stint_degradation(stint_trend_df: pd.DataFrame, session_name: str) -> p
     return fig
 
 
-def plot_stint_pace_evolution(laps_df: pd.DataFrame, driver: str, session_name: str) -> plt.Figure:
-    setup_style()
-    
+@themed
+def plot_stint_pace_evolution(laps_df: pd.DataFrame, driver: str, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
     driver_laps = laps_df[laps_df["Driver"] == driver].copy()
     
     if driver_laps.empty:
         fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, "No data available", ha="center", va="center", color="white")
+        ax.text(0.5, 0.5, "No data available", ha="center", va="center", color=theme.foreground)
         return fig
     
     stints = driver_laps["StintNumber"].unique()
@@ -184,8 +235,8 @@ def plot_stint_pace_evolution(laps_df: pd.DataFrame, driver: str, session_name:
     return fig
 
 
-def plot_long_run_comparison(long_run_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
+@themed
+def plot_long_run_comparison(long_run_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
     fig, axes = plt.subplots(1, 2, figsize=(14, 8))
     
     long_run_df = long_run_df.sort_values("LongRunDeficit")
@@ -193,12 +244,12 @@ def plot_long_run_comparison(long_run_df: pd.DataFrame, session_name: str) -> pl
     
     ax1 = axes[0]
     y_pos = np.arange(len(long_run_df))
-    ax1.barh(y_pos, long_run_df["LongRunDeficit"], color=colors, edgecolor="white", linewidth=0.5)
+    ax1.barh(y_pos, long_run_df["LongRunDeficit"], color=colors, edgecolor=theme.foreground, linewidth=0.5)
     ax1.set_yticks(y_pos)
     ax1.set_yticklabels([f"{row['RookieName']} ({row['Compound']})" for _, row in long_run_df.iterrows()])
     ax1.set_xlabel("Long Run Pace Deficit (seconds)")
     ax1.set_title("Long Run Pace Deficit to Teammate")
-    ax1.axvline(x=0, color="white", linestyle="-", linewidth=0.5)
+    ax1.axvline(x=0, color=theme.foreground, linestyle="-", linewidth=0.5)
     
     ax2 = axes[1]
     x = np.arange(len(long_run_df))
@@ -216,9 +267,9 @@ def plot_long_run_comparison(long_run_df: pd.DataFrame, session_name: str) -> pl
     return fig
 
 
-def plot_sector_heatmap(sector_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
-    
+@themed
+def plot_sector_heatmap(sector_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
     compounds = sector_df["Compound"].unique()
     n_compounds = len(compounds)
     
@@ -246,7 +297,7 @@ def plot_sector_heatmap(sector_df: pd.DataFrame, session_name: str) -> plt.Figur
             cbar_kws={"label": "Deficit (s)"},
             annot_kws={"color": "black"}
         )
-        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, "white"), fontweight="bold")
+        ax.set_title(f"{compound}", color=COMPOUND_COLORS.get(compound, theme.foreground), fontweight="bold")
         ax.set_xlabel("Sector")
         ax.set_ylabel("Rookie")
     
@@ -255,8 +306,36 @@ def plot_sector_heatmap(sector_df: pd.DataFrame, session_name: str) -> plt.Figur
     return fig
 
 
-def plot_track_evolution(evolution_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
+@themed
+def plot_minisector_heatmap(minisector_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
+    pivot = minisector_df.pivot_table(
+        index="RookieName",
+        columns="MiniSector",
+        values="TimeLoss",
+        aggfunc="mean"
+    )
+    pivot = pivot.loc[pivot.sum(axis=1).sort_values().index]
+    
+    fig, ax = plt.subplots(figsize=(max(12, 0.5 * pivot.shape[1]), max(4, 0.6 * len(pivot))))
+    
+    sns.heatmap(
+        pivot,
+        cmap="RdYlGn_r",
+        center=0,
+        ax=ax,
+        cbar_kws={"label": "Time lost (s)"},
+    )
+    ax.set_xlabel("Mini-sector")
+    ax.set_ylabel("Rookie")
+    
+    fig.suptitle(f"Mini-Sector Time Loss vs Teammate - {session_name}", fontsize=14, y=1.02)
+    plt.tight_layout()
+    return fig
+
+
+@themed
+def plot_track_evolution(evolution_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
     fig, ax = plt.subplots(figsize=(12, 6))
     
     ax.scatter(evolution_df["WindowMid"], evolution_df["BestTime"], color="#3498DB", s=100, zorder=3, label="Best Lap per Window")
@@ -278,22 +357,22 @@ def plot_track_evolution(evolution_df: pd.DataFrame, session_name: str) -> plt.F
             transform=ax.transAxes,
             fontsize=10,
             va="top",
-            color="white",
-            bbox=dict(boxstyle="round", facecolor="#333366", alpha=0.8)
+            color=theme.foreground,
+            bbox=dict(boxstyle="round", facecolor=theme.panel, alpha=0.8)
         )
     
     plt.tight_layout()
     return fig
 
 
-def plot_tyre_management_scores(tyre_scores_df: pd.DataFrame, session_name: str) -> plt.Figure:
-    setup_style()
-    
+@themed
+def plot_tyre_management_scores(tyre_scores_df: pd.DataFrame, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
     rookie_scores = tyre_scores_df[tyre_scores_df["IsRookie"] == True]
     
     if rookie_scores.empty:
         fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, "No rookie tyre management data available", ha="center", va="center", color="white")
+        ax.text(0.5, 0.5, "No rookie tyre management data available", ha="center", va="center", color=theme.foreground)
         return fig
     
     avg_scores = rookie_scores.groupby(["Driver", "DriverName", "Team"]).agg(
@@ -306,30 +385,30 @@ def plot_tyre_management_scores(tyre_scores_df: pd.DataFrame, session_name: str)
     colors = [TEAM_COLORS.get(team, "#888888") for team in avg_scores["Team"]]
     y_pos = np.arange(len(avg_scores))
     
-    ax.barh(y_pos, avg_scores["AvgScore"], color=colors, edgecolor="white", linewidth=0.5)
+    ax.barh(y_pos, avg_scores["AvgScore"], color=colors, edgecolor=theme.foreground, linewidth=0.5)
     
     ax.set_yticks(y_pos)
     ax.set_yticklabels(avg_scores["DriverName"])
     ax.set_xlabel("Tyre Management Score (higher = better)")
     ax.set_title(f"Rookie Tyre Management Scores - {session_name}")
-    ax.axvline(x=50, color="white", linestyle="--", linewidth=0.5, label="Median")
+    ax.axvline(x=50, color=theme.foreground, linestyle="--", linewidth=0.5, label="Median")
     
     for i, (score, trend) in enumerate(zip(avg_scores["AvgScore"], avg_scores["AvgTrendVsMedian"])):
         sign = "+" if trend > 0 else ""
-        ax.text(score + 1, i, f"{score:.1f} ({sign}{trend:.3f}s/lap)", va="center", fontsize=9, color="white")
+        ax.text(score + 1, i, f"{score:.1f} ({sign}{trend:.3f}s/lap)", va="center", fontsize=9, color=theme.foreground)
     
     plt.tight_layout()
     return fig
 
 
-def plot_corrections_breakdown(laps_df: pd.DataFrame, rookie: str, session_name: str) -> plt.Figure:
-    setup_style()
-    
+@themed
+def plot_corrections_breakdown(laps_df: pd.DataFrame, rookie: str, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+
     rookie_laps = laps_df[laps_df["Driver"] == rookie].sort_values("LapNumber")
     
     if rookie_laps.empty:
         fig, ax = plt.subplots()
-        ax.text(0.5, 0.5, "No data available", ha="center", va="center", color="white")
+        ax.text(0.5, 0.5, "No data available", ha="center", va="center", color=theme.foreground)
         return fig
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
@@ -369,9 +448,179 @@ def plot_corrections_breakdown(laps_df: pd.DataFrame, rookie: str, session_name:
     return fig
 
 
-def save_all_figures(figures: dict):
-    ensure_output_dir()
+@themed
+def plot_telemetry_traces(trace_df: pd.DataFrame, channel: str, session_name: str, theme: PlotTheme = DARK_THEME) -> plt.Figure:
+    channel_df = trace_df[trace_df["Channel"] == channel]
+    
+    if channel_df.empty:
+        fig, ax = plt.subplots()
+        ax.text(0.5, 0.5, "No telemetry available", ha="center", va="center", color=theme.foreground)
+        return fig
+    
+    pairs = channel_df.drop_duplicates("Rookie")
+    n_cols = min(3, len(pairs))
+    n_rows = int(np.ceil(len(pairs) / n_cols))
+    
+    fig, axes = plt.subplots(n_rows, n_cols, figsize=(6 * n_cols, 3.5 * n_rows), sharex=True, sharey=True, squeeze=False)
+    axes = axes.flatten()
+    
+    for ax, (_, pair) in zip(axes, pairs.iterrows()):
+        pair_df = channel_df[channel_df["Rookie"] == pair["Rookie"]]
+        regular = pair_df[pair_df["Role"] == "Regular"]
+        rookie = pair_df[pair_df["Role"] == "Rookie"]
+        
+        ax.plot(regular["Distance"], regular["Value"], "--", color=theme.foreground, linewidth=0.8, alpha=0.7, label=pair["RegularName"])
+        ax.plot(rookie["Distance"], rookie["Value"], "-", color=TEAM_COLORS.get(pair["Team"], "#E74C3C"), linewidth=1.0, label=pair["RookieName"])
+        
+        ax.set_title(f"{pair['RookieName']} vs {pair['RegularName']}", fontsize=11)
+        ax.legend(fontsize=8, loc="lower right")
+        ax.grid(True, alpha=0.3)
+    
+    for ax in axes[len(pairs):]:
+        ax.set_visible(False)
+    for ax in axes[(n_rows - 1) * n_cols:]:
+        ax.set_xlabel("Distance (m)")
+    for ax in axes[::n_cols]:
+        ax.set_ylabel(channel)
+    
+    fig.suptitle(f"Best Lap {channel} Traces - {session_name}", fontsize=14, y=1.02)
+    plt.tight_layout()
+    return fig
+
+
+def save_all_figures(figures: dict, config: RunConfig = DEFAULT_RUN_CONFIG, theme: PlotTheme = None):
+    theme = theme if theme is not None else get_plot_theme(config.plot_theme)
+    ensure_output_dir(config)
     for name, fig in figures.items():
-        filepath = Path(OUTPUT_DIR) / f"{name}.png"
-        fig.savefig(filepath, facecolor=fig.get_facecolor(), edgecolor="none")
-        plt.close(fig)
\ No newline at end of file
+        filepath = Path(config.output_dir) / f"{name}.png"
+        with theme.context():
+            fig.savefig(filepath, dpi=theme.dpi, facecolor=fig.get_facecolor(), edgecolor="none")
+        plt.close(fig)
+
+
+def _init_render_worker():
+    plt.switch_backend("Agg")
+
+
+def style_settings(theme: PlotTheme = DARK_THEME) -> Dict:
+    return {
+        "matplotlib": matplotlib.__version__,
+        "theme": {name: str(value) for name, value in asdict(theme).items()},
+        "rc_params": {name: str(value) for name, value in theme.rc_params.items()},
+        "compound_colors": COMPOUND_COLORS,
+        "team_colors": TEAM_COLORS,
+    }
+
+
+def _hash_argument(value) -> str:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha256(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        layout = value.dtypes if isinstance(value, pd.DataFrame) else {value.name: value.dtype}
+        digest.update(json.dumps({str(column): str(dtype) for column, dtype in layout.items()}).encode())
+        return digest.hexdigest()
+    return repr(value)
+
+
+def _function_identity(plot_function: Callable) -> Dict:
+    try:
+        source = inspect.getsource(plot_function)
+    except (OSError, TypeError):
+        source = ""
+    return {
+        "name": f"{plot_function.__module__}.{plot_function.__qualname__}",
+        "source": hashlib.sha256(source.encode()).hexdigest(),
+    }
+
+
+def figure_digest(plot_function: Callable, args: Tuple, style: Dict) -> str:
+    key = {
+        "schema": RENDER_CACHE_SCHEMA_VERSION,
+        "function": _function_identity(plot_function),
+        "args": [_hash_argument(value) for value in args],
+        "style": style,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def read_render_manifest(config: RunConfig = DEFAULT_RUN_CONFIG) -> Dict[str, Dict]:
+    path = Path(config.output_dir) / RENDER_MANIFEST
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except ValueError:
+        return {}
+
+
+def write_render_manifest(manifest: Dict[str, Dict], config: RunConfig = DEFAULT_RUN_CONFIG) -> Path:
+    path = Path(config.output_dir) / RENDER_MANIFEST
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+    return path
+
+
+def render_figure(
+    name: str,
+    plot_function: Callable,
+    args: Tuple,
+    output_dir: str,
+    theme: PlotTheme = DARK_THEME,
+) -> Path:
+    filepath = Path(output_dir) / f"{name}.png"
+    with theme.context():
+        fig = plot_function(*args, theme=theme)
+        fig.savefig(filepath, dpi=theme.dpi, facecolor=fig.get_facecolor(), edgecolor="none")
+    plt.close(fig)
+    return filepath
+
+
+def render_figures(
+    jobs: Dict[str, Tuple[Callable, Tuple]],
+    n_workers: int = None,
+    force: bool = False,
+    theme: PlotTheme = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Tuple[Dict[str, Path], List[str]]:
+    ensure_output_dir(config)
+    n_workers = config.render_workers if n_workers is None else n_workers
+    theme = theme if theme is not None else get_plot_theme(config.plot_theme)
+    
+    style = style_settings(theme)
+    digests = {name: figure_digest(plot_function, args, style) for name, (plot_function, args) in jobs.items()}
+    
+    manifest = read_render_manifest(config)
+    stale = [
+        name for name in jobs
+        if force
+        or manifest.get(name, {}).get("digest") != digests[name]
+        or not (Path(config.output_dir) / manifest[name]["file"]).exists()
+    ]
+    if stale:
+        write_render_manifest({name: entry for name, entry in manifest.items() if name not in stale}, config)
+    
+    paths = {}
+    if n_workers <= 1 or len(stale) <= 1:
+        for name in stale:
+            plot_function, args = jobs[name]
+            paths[name] = render_figure(name, plot_function, args, config.output_dir, theme)
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(stale)), initializer=_init_render_worker) as executor:
+            futures = {
+                executor.submit(render_figure, name, *jobs[name], config.output_dir, theme): name
+                for name in stale
+            }
+            for future in as_completed(futures):
+                paths[futures[future]] = future.result()
+    
+    for name, (plot_function, _) in jobs.items():
+        if name not in paths:
+            paths[name] = Path(config.output_dir) / manifest[name]["file"]
+        manifest[name] = {
+            "file": paths[name].name,
+            "digest": digests[name],
+            "function": _function_identity(plot_function)["name"],
+        }
+    write_render_manifest(manifest, config)
+    
+    return {name: paths[name] for name in jobs}, stale
\ No newline at end of file
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+from config import (
+    BOOTSTRAP_RESAMPLES,
+    BOOTSTRAP_SEED,
+    BOOTSTRAP_CONFIDENCE,
+    BOOTSTRAP_WORKERS,
+    BOOTSTRAP_BLOCK_SIZE,
+)
+
+
+BOOTSTRAP_STATISTICS = ("min", "mean")
+
+
+def resample_group_statistic(
+    values: np.ndarray,
+    group_index: np.ndarray,
+    n_groups: int,
+    statistic: str,
+    n_resamples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    if statistic not in BOOTSTRAP_STATISTICS:
+        available = ", ".join(BOOTSTRAP_STATISTICS)
+        raise ValueError(f"Unknown bootstrap statistic '{statistic}' (available: {available})")
+    
+    order = np.argsort(group_index, kind="stable")
+    values = np.asarray(values, dtype=float)[order]
+    sizes = np.bincount(group_index, minlength=n_groups)
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    draw_starts = np.repeat(offsets, sizes)
+    draw_lengths = np.repeat(sizes, sizes)
+    
+    samples = np.empty((n_resamples, n_groups))
+    rows_per_block = max(1, BOOTSTRAP_BLOCK_SIZE // max(len(values), 1))
+    
+    for first_row in range(0, n_resamples, rows_per_block):
+        rows = min(rows_per_block, n_resamples - first_row)
+        draws = rng.random((rows, len(values)))
+        index = draw_starts + (draws * draw_lengths).astype(np.int64)
+        resampled = values[index]
+        
+        if statistic == "min":
+            samples[first_row:first_row + rows] = np.minimum.reduceat(resampled, offsets, axis=1)
+        else:
+            samples[first_row:first_row + rows] = np.add.reduceat(resampled, offsets, axis=1) / sizes
+    
+    return samples
+
+
+def _side_samples(
+    laps: pd.DataFrame,
+    keys: pd.DataFrame,
+    value_column: str,
+    statistic: str,
+    stint_columns: Tuple[str, ...],
+    n_resamples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    keys = keys.reset_index(drop=True).assign(KeyIndex=lambda df: np.arange(len(df)))
+    laps = laps.dropna(subset=[value_column]).merge(keys, on=["Driver", "Compound"])
+    
+    samples = np.full((n_resamples, len(keys)), np.nan)
+    if laps.empty:
+        return samples
+    
+    if not stint_columns:
+        present = np.unique(laps["KeyIndex"].to_numpy())
+        group_index = np.searchsorted(present, laps["KeyIndex"].to_numpy())
+        samples[:, present] = resample_group_statistic(
+            laps[value_column].to_numpy(), group_index, len(present), statistic, n_resamples, rng
+        )
+        return samples
+    
+    stint_groups = laps.groupby(["KeyIndex"] + list(stint_columns), sort=True)
+    stint_index = stint_groups.ngroup().to_numpy()
+    stint_parent = stint_groups["KeyIndex"].first().to_numpy()
+    stint_samples = resample_group_statistic(
+        laps[value_column].to_numpy(), stint_index, len(stint_parent), statistic, n_resamples, rng
+    )
+    
+    present, stints_per_key = np.unique(stint_parent, return_counts=True)
+    key_offsets = np.concatenate([[0], np.cumsum(stints_per_key)[:-1]])
+    samples[:, present] = np.add.reduceat(stint_samples, key_offsets, axis=1) / stints_per_key
+    return samples
+
+
+def _bootstrap_pair_chunk(args) -> np.ndarray:
+    (
+        pairs,
+        subject_laps,
+        reference_laps,
+        value_column,
+        statistic,
+        stint_columns,
+        n_resamples,
+        confidence,
+        seed_sequence,
+    ) = args
+    rng = np.random.default_rng(seed_sequence)
+    
+    subject_keys = pairs[["Rookie", "Compound"]].drop_duplicates().rename(columns={"Rookie": "Driver"})
+    reference_keys = pairs[["Regular", "Compound"]].drop_duplicates().rename(columns={"Regular": "Driver"})
+    
+    subject_samples = _side_samples(
+        subject_laps, subject_keys, value_column, statistic, stint_columns, n_resamples, rng
+    )
+    reference_samples = _side_samples(
+        reference_laps, reference_keys, value_column, statistic, stint_columns, n_resamples, rng
+    )
+    
+    subject_position = pd.MultiIndex.from_frame(subject_keys).get_indexer(
+        pd.MultiIndex.from_frame(pairs[["Rookie", "Compound"]])
+    )
+    reference_position = pd.MultiIndex.from_frame(reference_keys).get_indexer(
+        pd.MultiIndex.from_frame(pairs[["Regular", "Compound"]])
+    )
+    deficits = subject_samples[:, subject_position] - reference_samples[:, reference_position]
+    
+    alpha = 1 - confidence
+    return np.percentile(deficits, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0).T
+
+
+def bootstrap_pair_deficits(
+    pairs: pd.DataFrame,
+    subject_laps: pd.DataFrame,
+    reference_laps: pd.DataFrame,
+    value_column: str,
+    statistic: str = "min",
+    stint_columns: Tuple[str, ...] = (),
+    n_resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = BOOTSTRAP_SEED,
+    confidence: float = BOOTSTRAP_CONFIDENCE,
+    n_workers: int = BOOTSTRAP_WORKERS,
+) -> pd.DataFrame:
+    if pairs.empty:
+        return pd.DataFrame(columns=["Lo", "Hi"], index=pairs.index, dtype=float)
+    
+    pair_keys = pairs[["Regular", "Rookie", "Compound"]].reset_index(drop=True)
+    lap_columns = ["Driver", "Compound", value_column] + list(stint_columns)
+    subject_laps = subject_laps[lap_columns]
+    reference_laps = reference_laps[lap_columns]
+    
+    n_chunks = max(1, min(n_workers, len(pair_keys)))
+    chunk_rows = np.array_split(np.arange(len(pair_keys)), n_chunks)
+    seed_sequences = np.random.SeedSequence(seed).spawn(n_chunks)
+    
+    jobs = []
+    for rows, seed_sequence in zip(chunk_rows, seed_sequences):
+        chunk = pair_keys.iloc[rows]
+        jobs.append((
+            chunk,
+            subject_laps[subject_laps["Driver"].isin(chunk["Rookie"])],
+            reference_laps[reference_laps["Driver"].isin(chunk["Regular"])],
+            value_column,
+            statistic,
+            tuple(stint_columns),
+            n_resamples,
+            confidence,
+            seed_sequence,
+        ))
+    
+    if n_chunks == 1:
+        intervals = [_bootstrap_pair_chunk(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+            intervals = list(executor.map(_bootstrap_pair_chunk, jobs))
+    
+    return pd.DataFrame(np.vstack(intervals), columns=["Lo", "Hi"], index=pairs.index)
\ No newline at end of file
@@ -129,10 +129,50 @@ TEAM_COLORS = {
 CACHE_DIR = "fastf1_cache"
 OUTPUT_DIR = "output"
 
+PARALLEL_SESSION_LOADING = True
+
+SEASON_EVENTS = [
+    {"year": YEAR, "gp_name": GP_NAME, "mapping": DRIVER_ROOKIE_MAPPING},
+]
+SEASON_WORKERS = 4
+SEASON_RESULTS_DIR = "season_results"
+
+RENDER_WORKERS = 4
+PLOT_THEME = "dark"
+
+IMPORT_TIME_BUDGET_MS = 1000
+IMPORT_GUARD_MODULES = ("main_advanced", "discover_drivers")
+LAZY_IMPORTS = ("matplotlib", "seaborn", "scipy", "fastf1")
+
+LOAD_PROFILES = {
+    "results-only": {"laps": False, "telemetry": False, "weather": False, "messages": False},
+    "laps-only": {"laps": True, "telemetry": False, "weather": False, "messages": False},
+    "laps+weather": {"laps": True, "telemetry": False, "weather": True, "messages": False},
+    "full-telemetry": {"laps": True, "telemetry": True, "weather": True, "messages": True},
+}
+DEFAULT_LOAD_PROFILE = "laps-only"
+
+LAP_CACHE_DIR = "lap_cache"
+LAP_CACHE_MAX_MB = 256
+USE_LAP_CACHE = True
+
+TELEMETRY_STORE_DIR = "telemetry_store"
+
+LAP_FILTERS = {
+    "exclude_pit_laps": True,
+    "require_accurate": True,
+}
+
 FUEL_EFFECT_PER_KG = 0.035
 FUEL_CONSUMPTION_KG_PER_LAP = 1.5
 ESTIMATED_START_FUEL_KG = 80
 
+START_FUEL_DISTRIBUTION = {"type": "normal", "mean": 80, "std": 12, "low": 30, "high": 110}
+FUEL_BURN_DISTRIBUTION = {"type": "triangular", "low": 1.3, "mode": 1.5, "high": 1.9}
+FUEL_UNCERTAINTY_SAMPLES = 10000
+FUEL_UNCERTAINTY_CHUNK_SIZE = 1000
+FUEL_UNCERTAINTY_SEED = 2025
+
 TIRE_DEGRADATION_ESTIMATES = {
     "SOFT": 0.08,
     "MEDIUM": 0.05,
@@ -141,6 +181,29 @@ TIRE_DEGRADATION_ESTIMATES = {
     "WET": 0.12,
 }
 
+SENSITIVITY_GRID = {
+    "FuelEffect": [0.030, 0.0325, 0.035, 0.0375, 0.040],
+    "FuelConsumption": [1.4, 1.6, 1.8, 2.0, 2.2],
+    "StartFuel": [60, 70, 80, 90, 100],
+    "DegradationScale": [0.0, 0.25, 0.5, 0.75, 1.0, 1.25, 1.5, 2.0],
+}
+
+PAIRING_MODE = "teammate"
+
+BOOTSTRAP_ENABLED = True
+BOOTSTRAP_RESAMPLES = 10000
+BOOTSTRAP_SEED = 2025
+BOOTSTRAP_CONFIDENCE = 0.95
+BOOTSTRAP_WORKERS = 1
+BOOTSTRAP_BLOCK_SIZE = 2000000
+
 MIN_LAPS_FOR_DEGRADATION = 4
+TYRE_SCORE_WEIGHT_BY_LAPS = False
 TRACK_EVOLUTION_WINDOW_MINUTES = 5
-OUTLIER_THRESHOLD_PERCENT = 107
\ No newline at end of file
+MAX_TRACK_EVOLUTION_RATE = 0.05
+OUTLIER_THRESHOLD_PERCENT = 107
+
+TELEMETRY_GRID_METERS = 1.0
+TELEMETRY_MINISECTORS = 25
+TELEMETRY_TRACE_POINTS = 500
+TELEMETRY_TRACE_DOWNSAMPLING = "lttb"
\ No newline at end of file
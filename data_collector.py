@@ -1,42 +1,210 @@
-import fastf1
+from __future__ import annotations
+
+import gc
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from config import LOAD_PROFILES
+from lap_cache import read_cached_laps, write_cached_laps
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
+
+if TYPE_CHECKING:
+    import fastf1
+
+
+LAP_SCHEMA = {
+    "Driver": "category",
+    "Team": "category",
+    "Compound": "category",
+    "LapNumber": "int16",
+    "LapStartTime": "timedelta64[ns]",
+    "LapTimeSeconds": "float32",
+    "Sector1Seconds": "float32",
+    "Sector2Seconds": "float32",
+    "Sector3Seconds": "float32",
+}
+
+DRIVER_INFO_COLUMNS = {
+    "Abbreviation": "Driver",
+    "DriverNumber": "DriverNumber",
+    "FullName": "FullName",
+    "TeamName": "Team",
+}
+
+
+class LapSession:
+    def __init__(
+        self,
+        name: str,
+        laps: pd.DataFrame,
+        session_start_time: pd.Timedelta,
+        drivers: Optional[pd.DataFrame] = None,
+    ):
+        self.name = name
+        self.laps = laps
+        self.session_start_time = session_start_time
+        self.drivers = drivers if drivers is not None else pd.DataFrame(columns=list(DRIVER_INFO_COLUMNS.values()))
 
-from config import YEAR, GP_NAME, SESSIONS, CACHE_DIR
 
+def setup_cache(config: RunConfig = DEFAULT_RUN_CONFIG):
+    import fastf1
 
-def setup_cache():
-    cache_path = Path(CACHE_DIR)
+    cache_path = Path(config.cache_dir)
     cache_path.mkdir(exist_ok=True)
     fastf1.Cache.enable_cache(str(cache_path))
 
 
-def load_session(session_name: str) -> fastf1.core.Session:
-    session = fastf1.get_session(YEAR, GP_NAME, session_name)
-    session.load()
+def get_load_options(profile: Optional[str] = None, config: RunConfig = DEFAULT_RUN_CONFIG) -> dict:
+    profile = profile if profile is not None else config.load_profile
+    if profile not in LOAD_PROFILES:
+        available = ", ".join(LOAD_PROFILES)
+        raise ValueError(f"Unknown load profile '{profile}' (available: {available})")
+    return dict(LOAD_PROFILES[profile])
+
+
+def load_session(
+    session_name: str,
+    profile: Optional[str] = None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> fastf1.core.Session:
+    import fastf1
+
+    session = fastf1.get_session(config.year, config.gp_name, session_name)
+    session.load(**get_load_options(profile, config))
     return session
 
 
-def load_all_sessions() -> dict:
-    setup_cache()
-    sessions = {}
-    for session_name in SESSIONS:
-        sessions[session_name] = load_session(session_name)
+def load_all_sessions(
+    parallel: Optional[bool] = None,
+    profile: Optional[str] = None,
+    session_names=None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> dict:
+    import fastf1
+
+    parallel = parallel if parallel is not None else config.parallel_session_loading
+    session_names = session_names if session_names is not None else config.sessions
+    setup_cache(config)
+    load_options = get_load_options(profile, config)
+
+    if not parallel or len(session_names) < 2:
+        sessions = {}
+        for session_name in session_names:
+            sessions[session_name] = load_session(session_name, profile, config)
+        return sessions
+
+    sessions = {
+        session_name: fastf1.get_session(config.year, config.gp_name, session_name)
+        for session_name in session_names
+    }
+
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        futures = {
+            session_name: executor.submit(session.load, **load_options)
+            for session_name, session in sessions.items()
+        }
+        for future in futures.values():
+            future.result()
+
     return sessions
 
 
-def get_lap_data(session: fastf1.core.Session) -> pd.DataFrame:
-    laps = session.laps.copy()
-    laps = laps[laps["PitOutTime"].isna() & laps["PitInTime"].isna()]
+def load_all_session_laps(
+    parallel: Optional[bool] = None,
+    profile: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    session_names=None,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> dict:
+    use_cache = use_cache if use_cache is not None else config.use_lap_cache
+    session_names = session_names if session_names is not None else config.sessions
+    lap_sessions = {}
+
+    if use_cache:
+        for session_name in session_names:
+            cached = read_cached_laps(session_name, config)
+            if cached is None:
+                continue
+            laps, session_info = cached
+            session_start_time = pd.to_timedelta(session_info["session_start_time"], unit="s")
+            drivers = pd.DataFrame(session_info["drivers"], columns=list(DRIVER_INFO_COLUMNS.values()))
+            lap_sessions[session_name] = LapSession(session_name, laps, session_start_time, drivers)
+
+    missing = [name for name in session_names if name not in lap_sessions]
+    if missing:
+        sessions = load_all_sessions(parallel, profile, missing, config)
+        for session_name in missing:
+            lap_session = extract_lap_session(sessions.pop(session_name), session_name, config)
+            if use_cache:
+                write_cached_laps(
+                    session_name,
+                    lap_session.laps,
+                    {
+                        "session_start_time": lap_session.session_start_time.total_seconds(),
+                        "drivers": lap_session.drivers.to_dict("records"),
+                    },
+                    config,
+                )
+            lap_sessions[session_name] = lap_session
+        del sessions
+        gc.collect()
+
+    return {name: lap_sessions[name] for name in session_names}
+
+
+def filter_session_laps(session: fastf1.core.Session, config: RunConfig = DEFAULT_RUN_CONFIG) -> fastf1.core.Laps:
+    laps = session.laps
+    if config.lap_filters["exclude_pit_laps"]:
+        laps = laps[laps["PitOutTime"].isna() & laps["PitInTime"].isna()]
     laps = laps[~laps["LapTime"].isna()]
-    laps = laps[laps["IsAccurate"] == True]
-    laps["LapTimeSeconds"] = laps["LapTime"].dt.total_seconds()
-    laps["Sector1Seconds"] = laps["Sector1Time"].dt.total_seconds()
-    laps["Sector2Seconds"] = laps["Sector2Time"].dt.total_seconds()
-    laps["Sector3Seconds"] = laps["Sector3Time"].dt.total_seconds()
+    if config.lap_filters["require_accurate"]:
+        laps = laps[laps["IsAccurate"] == True]
     return laps
 
 
+def get_lap_data(session: fastf1.core.Session, config: RunConfig = DEFAULT_RUN_CONFIG) -> pd.DataFrame:
+    if isinstance(session, LapSession):
+        return session.laps.copy()
+
+    laps = filter_session_laps(session, config)
+    slim = pd.DataFrame({
+        "Driver": laps["Driver"],
+        "Team": laps["Team"],
+        "Compound": laps["Compound"],
+        "LapNumber": laps["LapNumber"],
+        "LapStartTime": laps["LapStartTime"],
+        "LapTimeSeconds": laps["LapTime"].dt.total_seconds(),
+        "Sector1Seconds": laps["Sector1Time"].dt.total_seconds(),
+        "Sector2Seconds": laps["Sector2Time"].dt.total_seconds(),
+        "Sector3Seconds": laps["Sector3Time"].dt.total_seconds(),
+    })
+    return slim.astype(LAP_SCHEMA)
+
+
+def get_driver_info(session: fastf1.core.Session) -> pd.DataFrame:
+    if isinstance(session, LapSession):
+        return session.drivers.copy()
+
+    results = pd.DataFrame(session.results).reset_index(drop=True)
+    drivers = results.reindex(columns=list(DRIVER_INFO_COLUMNS)).rename(columns=DRIVER_INFO_COLUMNS)
+    return drivers.dropna(subset=["Driver"]).astype(str).reset_index(drop=True)
+
+
+def extract_lap_session(
+    session: fastf1.core.Session,
+    session_name: str,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> LapSession:
+    return LapSession(
+        session_name,
+        get_lap_data(session, config),
+        session.session_start_time,
+        get_driver_info(session),
+    )
+
+
 def get_telemetry_for_lap(lap) -> pd.DataFrame:
     try:
         telemetry = lap.get_telemetry()
@@ -45,10 +213,14 @@ def get_telemetry_for_lap(lap) -> pd.DataFrame:
         return pd.DataFrame()
 
 
-def get_best_lap_telemetry(session: fastf1.core.Session, driver: str) -> pd.DataFrame:
-    laps = get_lap_data(session)
+def get_best_lap_telemetry(
+    session: fastf1.core.Session,
+    driver: str,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    laps = filter_session_laps(session, config)
     driver_laps = laps[laps["Driver"] == driver]
     if driver_laps.empty:
         return pd.DataFrame()
-    best_lap = driver_laps.loc[driver_laps["LapTimeSeconds"].idxmin()]
+    best_lap = driver_laps.loc[driver_laps["LapTime"].idxmin()]
     return get_telemetry_for_lap(best_lap)
\ No newline at end of file
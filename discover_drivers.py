@@ -1,33 +1,43 @@
-import fastf1
-from pathlib import Path
+import argparse
+from typing import Dict, List
 
-from config import CACHE_DIR, YEAR, GP_NAME
+from config import YEAR, GP_NAME
+from data_collector import setup_cache, load_session, get_driver_info
+from lap_cache import read_cached_session_info
 
 
-def setup_cache():
-    cache_path = Path(CACHE_DIR)
-    cache_path.mkdir(exist_ok=True)
-    fastf1.Cache.enable_cache(str(cache_path))
+LOAD_PROFILE = "results-only"
 
 
-def discover_driver_codes(session_name: str = "FP1"):
+def fetch_driver_table(session_name: str, profile: str = LOAD_PROFILE) -> List[Dict]:
     setup_cache()
+    session = load_session(session_name, profile)
+    return get_driver_info(session).to_dict("records")
+
+
+def discover_driver_codes(session_name: str = "FP1", profile: str = LOAD_PROFILE, use_cache: bool = True):
+    session_info = read_cached_session_info(session_name) if use_cache else None
+    if session_info is not None:
+        drivers, source = session_info["drivers"], "lap cache"
+    else:
+        drivers, source = fetch_driver_table(session_name, profile), "FastF1"
     
-    session = fastf1.get_session(YEAR, GP_NAME, session_name)
-    session.load()
-    
-    print(f"\n{YEAR} {GP_NAME} GP - {session_name}")
+    print(f"\n{YEAR} {GP_NAME} GP - {session_name} ({source})")
     print("=" * 50)
     print(f"\n{'Code':<8} {'Number':<8} {'Full Name':<25} {'Team'}")
     print("-" * 60)
     
-    for driver_num in session.drivers:
-        driver_info = session.get_driver(driver_num)
-        code = driver_info.get("Abbreviation", "???")
-        full_name = driver_info.get("FullName", "Unknown")
-        team = driver_info.get("TeamName", "Unknown")
-        print(f"{code:<8} {driver_num:<8} {full_name:<25} {team}")
+    for driver in drivers:
+        print(f"{driver['Driver']:<8} {driver['DriverNumber']:<8} {driver['FullName']:<25} {driver['Team']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List driver codes for a session of the configured event")
+    parser.add_argument("--session", default="FP1", help="Session name (default FP1)")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false", help="Always ask FastF1")
+    args = parser.parse_args(argv)
+    discover_driver_codes(args.session, use_cache=args.use_cache)
 
 
 if __name__ == "__main__":
-    discover_driver_codes("FP1")
\ No newline at end of file
+    main()
\ No newline at end of file
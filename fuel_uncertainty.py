@@ -0,0 +1,187 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Tuple
+from scipy import stats
+
+from config import (
+    FUEL_EFFECT_PER_KG,
+    START_FUEL_DISTRIBUTION,
+    FUEL_BURN_DISTRIBUTION,
+    FUEL_UNCERTAINTY_SAMPLES,
+    FUEL_UNCERTAINTY_CHUNK_SIZE,
+    FUEL_UNCERTAINTY_SEED,
+)
+from data_collector import load_all_session_laps
+from run_config import RunConfig, DEFAULT_RUN_CONFIG, add_run_config_arguments, run_config_from_args
+from advanced_analysis import PreparedSession, as_prepared_session, pair_driver_aggregates
+from sensitivity_analysis import (
+    baseline_parameters,
+    corrected_time_matrix,
+    paired_deficit_matrix,
+    rookie_deficit_matrix,
+)
+
+
+DISTRIBUTION_TYPES = ("normal", "uniform", "triangular")
+
+
+def sample_distribution(spec: Dict, size, rng: np.random.Generator) -> np.ndarray:
+    kind = spec["type"]
+    
+    if kind == "normal":
+        samples = rng.normal(spec["mean"], spec["std"], size)
+        return np.clip(samples, spec.get("low", -np.inf), spec.get("high", np.inf))
+    if kind == "uniform":
+        return rng.uniform(spec["low"], spec["high"], size)
+    if kind == "triangular":
+        return rng.triangular(spec["low"], spec["mode"], spec["high"], size)
+    
+    available = ", ".join(DISTRIBUTION_TYPES)
+    raise ValueError(f"Unknown distribution type '{kind}' (available: {available})")
+
+
+def sampled_fuel_corrections(
+    lap_numbers: np.ndarray,
+    reference_lap: int,
+    start_fuel: np.ndarray,
+    burn_rate: np.ndarray,
+    fuel_effect: float = FUEL_EFFECT_PER_KG,
+) -> np.ndarray:
+    fuel_at_lap = np.maximum(start_fuel - (lap_numbers - 1) * burn_rate, 5)
+    fuel_at_reference = np.maximum(start_fuel - (reference_lap - 1) * burn_rate, 5)
+    return (fuel_at_lap - fuel_at_reference) * fuel_effect
+
+
+class _SessionSampler:
+    def __init__(self, session):
+        prepared = as_prepared_session(session)
+        self.laps = prepared.representative_laps
+        self.reference_lap = int(prepared.fuel_corrected_laps["LapNumber"].median())
+        self.fuel_effect = prepared.config.fuel_effect_per_kg
+        self.lap_times = self.laps["LapTimeSeconds"].to_numpy(dtype=float)
+        self.lap_numbers = self.laps["LapNumber"].to_numpy(dtype=float)
+        self.driver_codes, self.drivers = pd.factorize(self.laps["Driver"])
+    
+    def corrected_times(self, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+        shape = (n_samples, len(self.drivers))
+        start_fuel = sample_distribution(START_FUEL_DISTRIBUTION, shape, rng)[:, self.driver_codes]
+        burn_rate = sample_distribution(FUEL_BURN_DISTRIBUTION, shape, rng)[:, self.driver_codes]
+        
+        corrections = sampled_fuel_corrections(
+            self.lap_numbers, self.reference_lap, start_fuel, burn_rate, self.fuel_effect
+        )
+        return self.lap_times + corrections
+
+
+def run_fuel_uncertainty(
+    fp1_session,
+    fp2_session,
+    pairing=None,
+    n_samples: int = FUEL_UNCERTAINTY_SAMPLES,
+    chunk_size: int = FUEL_UNCERTAINTY_CHUNK_SIZE,
+    seed: int = FUEL_UNCERTAINTY_SEED,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    fp1 = as_prepared_session(fp1_session, config)
+    fp2 = as_prepared_session(fp2_session, config)
+    
+    pairs = pair_driver_aggregates(
+        fp1.representative_laps,
+        fp2.representative_laps,
+        {"LapCount": ("LapTimeSeconds", "size")},
+        pairing,
+        config=config,
+    )
+    
+    if pairs.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    baseline = baseline_parameters(config)
+    pair_table, baseline_pair_deficits = paired_deficit_matrix(
+        pairs,
+        *corrected_time_matrix(fp1, baseline),
+        *corrected_time_matrix(fp2, baseline),
+    )
+    rookie_table, _, baseline_deficits = rookie_deficit_matrix(pair_table, baseline_pair_deficits)
+    baseline_ranks = stats.rankdata(baseline_deficits, method="min", axis=1).astype(int)[0]
+    
+    rookie_sampler = _SessionSampler(fp1)
+    regular_sampler = _SessionSampler(fp2)
+    rng = np.random.default_rng(seed)
+    
+    deficits = np.empty((n_samples, len(rookie_table)))
+    ranks = np.empty((n_samples, len(rookie_table)), dtype=int)
+    
+    for first_sample in range(0, n_samples, chunk_size):
+        rows = min(chunk_size, n_samples - first_sample)
+        _, pair_deficits = paired_deficit_matrix(
+            pairs,
+            rookie_sampler.laps,
+            rookie_sampler.corrected_times(rows, rng),
+            regular_sampler.laps,
+            regular_sampler.corrected_times(rows, rng),
+        )
+        _, _, chunk_deficits = rookie_deficit_matrix(pair_table, pair_deficits)
+        
+        deficits[first_sample:first_sample + rows] = chunk_deficits
+        ranks[first_sample:first_sample + rows] = stats.rankdata(chunk_deficits, method="min", axis=1)
+    
+    distribution = pd.DataFrame(deficits, columns=rookie_table["Rookie"])
+    
+    percentiles = np.percentile(deficits, [5, 50, 95], axis=0)
+    summary = rookie_table.assign(
+        BaselineDeficit=baseline_deficits[0],
+        MeanDeficit=deficits.mean(axis=0),
+        StdDeficit=deficits.std(axis=0),
+        DeficitP05=percentiles[0],
+        DeficitP50=percentiles[1],
+        DeficitP95=percentiles[2],
+        ProbSlower=(deficits > 0).mean(axis=0),
+        BaselineRank=baseline_ranks,
+        MedianRank=np.median(ranks, axis=0),
+        ShareAtBaselineRank=(ranks == baseline_ranks).mean(axis=0),
+    ).sort_values("BaselineRank").reset_index(drop=True)
+    
+    return distribution, summary
+
+
+def main(argv=None, config: RunConfig = DEFAULT_RUN_CONFIG):
+    parser = argparse.ArgumentParser(description="Monte Carlo over per-driver fuel loads")
+    add_run_config_arguments(parser)
+    config = run_config_from_args(parser.parse_args(argv), config)
+    
+    print("Loading session data...")
+    sessions = load_all_session_laps(config=config)
+    fp1 = PreparedSession(sessions["FP1"], "FP1", config)
+    fp2 = PreparedSession(sessions["FP2"], "FP2", config)
+    
+    print(f"Sampling {FUEL_UNCERTAINTY_SAMPLES} fuel scenarios...")
+    start = time.perf_counter()
+    distribution, summary = run_fuel_uncertainty(fp1, fp2, config=config)
+    elapsed = time.perf_counter() - start
+    
+    if summary.empty:
+        print("No rookie/regular pairs with matching compounds")
+        return
+    
+    Path(config.output_dir).mkdir(exist_ok=True)
+    summary.to_csv(Path(config.output_dir) / "fuel_uncertainty_summary.csv", index=False)
+    distribution.describe(percentiles=[0.05, 0.25, 0.5, 0.75, 0.95]).T.to_csv(
+        Path(config.output_dir) / "fuel_uncertainty_distribution.csv"
+    )
+    
+    print(f"\n{len(distribution)} samples in {elapsed:.2f}s\n")
+    
+    for _, row in summary.iterrows():
+        print(
+            f"{row['BaselineRank']:>2}. {row['RookieName']:<20} "
+            f"{row['BaselineDeficit']:+.3f}s (90%: {row['DeficitP05']:+.3f}s to {row['DeficitP95']:+.3f}s), "
+            f"P(slower) {row['ProbSlower']:.0%}, {row['ShareAtBaselineRank']:.0%} at baseline rank"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
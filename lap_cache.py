@@ -0,0 +1,206 @@
+import argparse
+import hashlib
+import json
+import os
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from config import YEAR, GP_NAME, LAP_CACHE_DIR, LAP_CACHE_MAX_MB
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
+
+
+LAP_CACHE_SCHEMA_VERSION = 3
+METADATA_KEY = b"lap_cache"
+
+
+def get_fastf1_version() -> str:
+    try:
+        return metadata.version("fastf1")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def event_prefix(year: int = YEAR, gp_name: str = GP_NAME) -> str:
+    return f"{year}_{gp_name.replace(' ', '_')}"
+
+
+def lap_cache_key(session_name: str, config: RunConfig = DEFAULT_RUN_CONFIG) -> Dict:
+    return {
+        "schema": LAP_CACHE_SCHEMA_VERSION,
+        "year": config.year,
+        "gp_name": config.gp_name,
+        "session": session_name,
+        "fastf1": get_fastf1_version(),
+        "filters": config.lap_filters,
+    }
+
+
+def lap_cache_path(key: Dict, cache_dir: str = LAP_CACHE_DIR) -> Path:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    prefix = event_prefix(key["year"], key["gp_name"])
+    return Path(cache_dir) / f"{prefix}_{key['session']}_{digest}.feather"
+
+
+def _to_arrow_table(laps: pd.DataFrame) -> pa.Table:
+    laps = pd.DataFrame(laps)
+    try:
+        return pa.Table.from_pandas(laps, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        object_columns = laps.select_dtypes(include="object").columns
+        laps[object_columns] = laps[object_columns].astype("string")
+        return pa.Table.from_pandas(laps, preserve_index=False)
+
+
+def read_cached_laps(
+    session_name: str,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Optional[Tuple[pd.DataFrame, Dict]]:
+    path = lap_cache_path(lap_cache_key(session_name, config), config.lap_cache_dir)
+    if not path.exists():
+        return None
+    
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid):
+        path.unlink(missing_ok=True)
+        return None
+    
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    session_info = json.loads(table.schema.metadata[METADATA_KEY])
+    return table.to_pandas(), session_info
+
+
+def read_cached_session_info(
+    session_name: str,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Optional[Dict]:
+    path = lap_cache_path(lap_cache_key(session_name, config), config.lap_cache_dir)
+    if not path.exists():
+        return None
+    
+    try:
+        with pa.memory_map(str(path)) as source:
+            schema = pa.ipc.open_file(source).schema
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return json.loads(schema.metadata[METADATA_KEY])
+
+
+def write_cached_laps(
+    session_name: str,
+    laps: pd.DataFrame,
+    session_info: Dict,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Path:
+    key = lap_cache_key(session_name, config)
+    path = lap_cache_path(key, config.lap_cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    table = _to_arrow_table(laps)
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[METADATA_KEY] = json.dumps({**session_info, "key": key}).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+    
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        feather.write_feather(table, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    
+    evict_lap_cache(config.lap_cache_max_mb, config.lap_cache_dir)
+    return path
+
+
+def lap_cache_stats(cache_dir: str = LAP_CACHE_DIR) -> List[Tuple[Path, os.stat_result]]:
+    entries = []
+    for path in Path(cache_dir).glob("*.feather"):
+        try:
+            entries.append((path, path.stat()))
+        except FileNotFoundError:
+            continue
+    return sorted(entries, key=lambda entry: entry[1].st_mtime)
+
+
+def list_lap_cache(cache_dir: str = LAP_CACHE_DIR) -> List[Path]:
+    return [path for path, _ in lap_cache_stats(cache_dir)]
+
+
+def invalidate_lap_cache(
+    session_name: Optional[str] = None,
+    year: Optional[int] = YEAR,
+    gp_name: Optional[str] = GP_NAME,
+    cache_dir: str = LAP_CACHE_DIR,
+) -> List[Path]:
+    if year is None or gp_name is None:
+        pattern = "*.feather"
+    elif session_name is None:
+        pattern = f"{event_prefix(year, gp_name)}_*.feather"
+    else:
+        pattern = f"{event_prefix(year, gp_name)}_{session_name}_*.feather"
+    
+    removed = []
+    for path in Path(cache_dir).glob(pattern):
+        path.unlink(missing_ok=True)
+        removed.append(path)
+    return removed
+
+
+def evict_lap_cache(max_mb: float = LAP_CACHE_MAX_MB, cache_dir: str = LAP_CACHE_DIR) -> List[Path]:
+    entries = lap_cache_stats(cache_dir)
+    total = sum(stat.st_size for _, stat in entries)
+    max_bytes = max_mb * 1024 * 1024
+    
+    removed = []
+    for path, stat in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= stat.st_size
+        removed.append(path)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the prepared lap table cache")
+    parser.add_argument("--cache-dir", default=LAP_CACHE_DIR, help="Lap cache directory")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    subparsers.add_parser("list", help="List cached lap tables, least recently used first")
+    
+    clear_parser = subparsers.add_parser("clear", help="Invalidate cached lap tables")
+    clear_parser.add_argument("--session", help="Only clear this session (e.g. FP1)")
+    clear_parser.add_argument("--all-events", action="store_true", help="Clear every event, not just the configured one")
+    
+    evict_parser = subparsers.add_parser("evict", help="Evict least recently used tables above the size limit")
+    evict_parser.add_argument("--max-mb", type=float, default=LAP_CACHE_MAX_MB)
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "list":
+        entries = lap_cache_stats(args.cache_dir)
+        for path, stat in entries:
+            print(f"{stat.st_size / 1024:>10.1f} KB  {path.name}")
+        total_mb = sum(stat.st_size for _, stat in entries) / 1024 / 1024
+        print(f"{len(entries)} tables, {total_mb:.1f} MB (limit {LAP_CACHE_MAX_MB} MB)")
+    elif args.command == "clear":
+        if args.all_events:
+            removed = invalidate_lap_cache(year=None, gp_name=None, cache_dir=args.cache_dir)
+        else:
+            removed = invalidate_lap_cache(args.session, cache_dir=args.cache_dir)
+        print(f"Removed {len(removed)} cached lap tables")
+    elif args.command == "evict":
+        removed = evict_lap_cache(args.max_mb, args.cache_dir)
+        print(f"Evicted {len(removed)} cached lap tables")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,95 +1,99 @@
+import argparse
 import pandas as pd
 from pathlib import Path
 
-from config import OUTPUT_DIR, ROOKIE_DRIVERS
-from data_collector import load_all_sessions, get_lap_data
+from run_config import RunConfig, DEFAULT_RUN_CONFIG, add_run_config_arguments, run_config_from_args
+from data_collector import load_all_session_laps
 from advanced_analysis import (
+    PreparedSession,
     calculate_track_evolution_model,
-    add_fully_corrected_times,
+    calculate_track_evolution_breakdown,
     calculate_compound_matched_pace,
     calculate_aggregate_pace_deficit,
+    calculate_stint_summary,
     calculate_stint_analysis,
     calculate_stint_pace_trend,
     calculate_tyre_management_score,
     calculate_long_run_pace,
+    get_long_run_laps,
     compare_long_run_pace,
     calculate_advanced_sector_analysis,
     generate_advanced_summary,
-    calculate_empirical_degradation,
-    add_stint_info,
-    add_fuel_corrected_times,
-)
-from advanced_visualizations import (
-    plot_compound_matched_pace,
-    plot_aggregate_pace_comparison,
-    plot_stint_degradation,
-    plot_stint_pace_evolution,
-    plot_long_run_comparison,
-    plot_sector_heatmap,
-    plot_track_evolution,
-    plot_tyre_management_scores,
-    plot_corrections_breakdown,
-    save_all_figures,
 )
 from advanced_report import generate_advanced_report, save_report
+from profiling import memory_summary
 
 
-def ensure_output_dir():
-    Path(OUTPUT_DIR).mkdir(exist_ok=True)
+def ensure_output_dir(config: RunConfig = DEFAULT_RUN_CONFIG):
+    Path(config.output_dir).mkdir(exist_ok=True)
 
 
-def export_dataframes(dataframes: dict):
-    ensure_output_dir()
+def export_dataframes(dataframes: dict, config: RunConfig = DEFAULT_RUN_CONFIG):
+    ensure_output_dir(config)
     for name, df in dataframes.items():
         if isinstance(df, pd.DataFrame) and not df.empty:
-            filepath = Path(OUTPUT_DIR) / f"{name}.csv"
+            filepath = Path(config.output_dir) / f"{name}.csv"
             df.to_csv(filepath, index=False)
 
 
-def main():
+def run_analysis(config: RunConfig = DEFAULT_RUN_CONFIG, force_render: bool = False, plots: bool = True):
     print("Loading session data...")
-    sessions = load_all_sessions()
-    fp1 = sessions["FP1"]
-    fp2 = sessions["FP2"]
+    sessions = load_all_session_laps(config=config)
+    fp1 = PreparedSession(sessions["FP1"], "FP1", config)
+    fp2 = PreparedSession(sessions["FP2"], "FP2", config)
+    print(memory_summary("after loading"))
     
     print("Building track evolution model...")
-    fp1_evolution = calculate_track_evolution_model(fp1)
-    fp2_evolution = calculate_track_evolution_model(fp2)
+    fp1_evolution = calculate_track_evolution_model(fp1, config=config)
+    fp2_evolution = calculate_track_evolution_model(fp2, config=config)
+    fp1_evolution_breakdown = calculate_track_evolution_breakdown(fp1, config=config)
+    fp2_evolution_breakdown = calculate_track_evolution_breakdown(fp2, config=config)
     
     print("Calculating empirical tyre degradation...")
-    fp1_laps_raw = get_lap_data(fp1)
-    fp1_laps_with_stints = add_stint_info(fp1_laps_raw)
-    fp1_laps_fuel_corrected = add_fuel_corrected_times(fp1_laps_with_stints)
-    empirical_deg = calculate_empirical_degradation(fp1_laps_fuel_corrected)
+    empirical_deg = fp1.empirical_degradation
     
     for compound, stats in empirical_deg.items():
         print(f"  {compound}: {stats['median']:.4f} s/lap ({stats['n_stints']} stints)")
     
     print("Preparing corrected lap data...")
-    fp1_laps = get_lap_data(fp1)
-    fp1_laps_corrected = add_fully_corrected_times(fp1_laps, fp1_evolution, empirical_deg)
+    fp1_laps_corrected = fp1.fully_corrected_laps(fp1_evolution, empirical_deg)
     
     print("Calculating compound-matched pace (FP1 rookies vs FP2 regulars)...")
-    compound_pace = calculate_compound_matched_pace(fp1, fp2, fp1_evolution, fp2_evolution)
+    compound_pace = calculate_compound_matched_pace(
+        fp1, fp2, fp1_evolution, fp2_evolution, bootstrap=config.bootstrap_enabled, config=config
+    )
     
     print("Calculating aggregate pace...")
     aggregate_pace = calculate_aggregate_pace_deficit(compound_pace)
     
+    print("Summarizing stints...")
+    stint_summary = calculate_stint_summary(
+        {"FP1": fp1, "FP2": fp2},
+        {"FP1": fp1_evolution, "FP2": fp2_evolution},
+        config,
+    )
+    
     print("Analyzing stints...")
-    stint_analysis = calculate_stint_analysis(fp1, fp1_evolution)
+    stint_analysis = calculate_stint_analysis(fp1, fp1_evolution, config)
     
     print("Calculating stint pace trends...")
-    stint_trends = calculate_stint_pace_trend(fp1, fp2, fp1_evolution, fp2_evolution)
+    stint_trends = calculate_stint_pace_trend(fp1, fp2, fp1_evolution, fp2_evolution, config)
     
     print("Calculating tyre management scores...")
-    tyre_scores = calculate_tyre_management_score(stint_trends)
+    tyre_scores = calculate_tyre_management_score(stint_trends, config=config)
     
     print("Analyzing long runs...")
-    long_runs = calculate_long_run_pace(fp1, fp2, fp1_evolution, fp2_evolution)
-    long_run_comparison = compare_long_run_pace(long_runs)
+    long_runs = calculate_long_run_pace(fp1, fp2, fp1_evolution, fp2_evolution, config=config)
+    long_run_laps = (
+        get_long_run_laps(fp1, fp2, fp1_evolution, fp2_evolution, config=config)
+        if config.bootstrap_enabled else None
+    )
+    long_run_comparison = compare_long_run_pace(
+        long_runs, long_run_laps=long_run_laps, bootstrap=config.bootstrap_enabled, config=config
+    )
     
     print("Analyzing sectors (FP1 rookies vs FP2 regulars)...")
-    sector_analysis = calculate_advanced_sector_analysis(fp1, fp2, fp1_evolution, fp2_evolution)
+    sector_analysis = calculate_advanced_sector_analysis(fp1, fp2, fp1_evolution, fp2_evolution, config=config)
     
     print("Generating summary...")
     summary = generate_advanced_summary(
@@ -97,43 +101,59 @@ def main():
         aggregate_pace,
         stint_trends,
         long_run_comparison,
+        config,
     )
     
-    print("Creating visualizations...")
-    figures = {}
-    
-    figures["track_evolution_fp1"] = plot_track_evolution(fp1_evolution, "FP1")
-    figures["track_evolution_fp2"] = plot_track_evolution(fp2_evolution, "FP2")
-    
-    if not compound_pace.empty:
-        figures["compound_matched_pace"] = plot_compound_matched_pace(compound_pace, "FP1")
-    
-    if not aggregate_pace.empty:
-        figures["aggregate_pace_comparison"] = plot_aggregate_pace_comparison(aggregate_pace, "FP1")
-    
-    if not stint_trends.empty:
-        figures["stint_pace_trends"] = plot_stint_degradation(stint_trends, "FP1+FP2")
-    
-    if not long_run_comparison.empty:
-        figures["long_run_comparison"] = plot_long_run_comparison(long_run_comparison, "FP1")
-    
-    if not sector_analysis.empty:
-        figures["sector_heatmap"] = plot_sector_heatmap(sector_analysis, "FP1")
-    
-    if not tyre_scores.empty:
-        figures["tyre_management_scores"] = plot_tyre_management_scores(tyre_scores, "FP1")
-    
-    for rookie in ROOKIE_DRIVERS:
-        if rookie in fp1_laps_corrected["Driver"].values:
-            figures[f"stint_evolution_{rookie}"] = plot_stint_pace_evolution(
-                fp1_laps_corrected, rookie, "FP1"
-            )
-            figures[f"corrections_breakdown_{rookie}"] = plot_corrections_breakdown(
-                fp1_laps_corrected, rookie, "FP1"
-            )
-    
-    print("Saving visualizations...")
-    save_all_figures(figures)
+    print(memory_summary("after analysis"))
+    
+    figure_paths = {}
+    if plots:
+        print("Creating visualizations...")
+        from advanced_visualizations import (
+            plot_compound_matched_pace,
+            plot_aggregate_pace_comparison,
+            plot_stint_degradation,
+            plot_stint_pace_evolution,
+            plot_long_run_comparison,
+            plot_sector_heatmap,
+            plot_track_evolution,
+            plot_tyre_management_scores,
+            plot_corrections_breakdown,
+            render_figures,
+        )
+        
+        plot_jobs = {}
+        
+        plot_jobs["track_evolution_fp1"] = (plot_track_evolution, (fp1_evolution, "FP1"))
+        plot_jobs["track_evolution_fp2"] = (plot_track_evolution, (fp2_evolution, "FP2"))
+        
+        if not compound_pace.empty:
+            plot_jobs["compound_matched_pace"] = (plot_compound_matched_pace, (compound_pace, "FP1"))
+        
+        if not aggregate_pace.empty:
+            plot_jobs["aggregate_pace_comparison"] = (plot_aggregate_pace_comparison, (aggregate_pace, "FP1"))
+        
+        if not stint_trends.empty:
+            plot_jobs["stint_pace_trends"] = (plot_stint_degradation, (stint_trends, "FP1+FP2"))
+        
+        if not long_run_comparison.empty:
+            plot_jobs["long_run_comparison"] = (plot_long_run_comparison, (long_run_comparison, "FP1"))
+        
+        if not sector_analysis.empty:
+            plot_jobs["sector_heatmap"] = (plot_sector_heatmap, (sector_analysis, "FP1"))
+        
+        if not tyre_scores.empty:
+            plot_jobs["tyre_management_scores"] = (plot_tyre_management_scores, (tyre_scores, "FP1"))
+        
+        for rookie in config.rookie_drivers:
+            rookie_laps = fp1_laps_corrected[fp1_laps_corrected["Driver"] == rookie]
+            if not rookie_laps.empty:
+                plot_jobs[f"stint_evolution_{rookie}"] = (plot_stint_pace_evolution, (rookie_laps, rookie, "FP1"))
+                plot_jobs[f"corrections_breakdown_{rookie}"] = (plot_corrections_breakdown, (rookie_laps, rookie, "FP1"))
+        
+        figure_paths, rendered = render_figures(plot_jobs, force=force_render, config=config)
+        print(f"Rendered {len(rendered)} of {len(plot_jobs)} visualizations ({len(plot_jobs) - len(rendered)} unchanged)")
+        print(memory_summary("after plotting"))
     
     print("Exporting data...")
     
@@ -145,9 +165,12 @@ def main():
     dataframes = {
         "track_evolution_fp1": fp1_evolution,
         "track_evolution_fp2": fp2_evolution,
+        "track_evolution_breakdown_fp1": fp1_evolution_breakdown,
+        "track_evolution_breakdown_fp2": fp2_evolution_breakdown,
         "empirical_degradation": empirical_deg_df,
         "compound_matched_pace": compound_pace,
         "aggregate_pace_deficit": aggregate_pace,
+        "stint_summary": stint_summary,
         "stint_analysis": stint_analysis,
         "stint_pace_trends": stint_trends,
         "tyre_management_scores": tyre_scores,
@@ -156,10 +179,10 @@ def main():
         "sector_analysis": sector_analysis,
         "corrected_laps_fp1": fp1_laps_corrected,
     }
-    export_dataframes(dataframes)
+    export_dataframes(dataframes, config)
     
     summary_df = pd.DataFrame([summary])
-    summary_df.to_csv(Path(OUTPUT_DIR) / "summary.csv", index=False)
+    summary_df.to_csv(Path(config.output_dir) / "summary.csv", index=False)
     
     print("Generating report...")
     report_content = generate_advanced_report(
@@ -171,10 +194,11 @@ def main():
         sector_analysis,
         fp1_evolution,
         summary,
+        config,
     )
-    report_path = save_report(report_content)
+    report_path = save_report(report_content, config)
     
-    print(f"\nComplete. Output: {OUTPUT_DIR}/")
+    print(f"\nComplete. Output: {config.output_dir}/ ({len(figure_paths)} figures)")
     print(f"Rookies: {summary['rookies_with_data']}/{summary['total_rookies']}")
     if summary["avg_corrected_deficit"]:
         print(f"Avg deficit: +{summary['avg_corrected_deficit']:.3f}s")
@@ -182,5 +206,14 @@ def main():
         print(f"Best: {summary['best_rookie']} (+{summary['best_corrected_deficit']:.3f}s)")
 
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FP1 rookie vs FP2 regular pace analysis")
+    parser.add_argument("--force-render", action="store_true", help="Redraw every figure, ignoring the render cache")
+    parser.add_argument("--no-plots", dest="plots", action="store_false", help="Only export CSVs and the report")
+    add_run_config_arguments(parser)
+    args = parser.parse_args(argv)
+    run_analysis(run_config_from_args(args), args.force_render, args.plots)
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from config import IMPORT_TIME_BUDGET_MS, IMPORT_GUARD_MODULES, LAZY_IMPORTS
+
+
+def peak_rss_mb() -> float:
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+def memory_summary(label: str) -> str:
+    return f"  Memory {label}: {current_rss_mb():.0f} MB RSS (peak {peak_rss_mb():.0f} MB)"
+
+
+def import_times(module: str) -> List[Tuple[str, int, float, float]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=Path(__file__).resolve().parent,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1]}")
+    
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            rows.append((name.strip(), depth, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return rows
+
+
+def import_time_summary(module: str, repeat: int = 3, top: int = 5) -> Dict:
+    rows = min((import_times(module) for _ in range(repeat)), key=lambda run: run[-1][3])
+    
+    imported = []
+    for name, depth, _, cumulative in reversed(rows[:-1]):
+        if depth == 0:
+            break
+        imported.append((name, cumulative))
+    
+    packages = sorted(
+        ((name, cumulative) for name, cumulative in imported if "." not in name),
+        key=lambda package: package[1],
+        reverse=True,
+    )
+    imported_roots = {name.split(".")[0] for name, _ in imported}
+    return {
+        "module": module,
+        "total_ms": rows[-1][3],
+        "packages": packages[:top],
+        "heavy": [name for name in LAZY_IMPORTS if name in imported_roots],
+    }
+
+
+def check_import_times(
+    modules=IMPORT_GUARD_MODULES,
+    budget_ms: float = IMPORT_TIME_BUDGET_MS,
+    repeat: int = 3,
+) -> List[str]:
+    problems = []
+    for module in modules:
+        summary = import_time_summary(module, repeat)
+        packages = ", ".join(f"{name} {cumulative:.0f}" for name, cumulative in summary["packages"])
+        print(f"{module:<24} {summary['total_ms']:>7.0f} ms  ({packages})")
+        
+        if summary["total_ms"] > budget_ms:
+            problems.append(f"{module} takes {summary['total_ms']:.0f} ms to import (budget {budget_ms:.0f} ms)")
+        if summary["heavy"]:
+            problems.append(f"{module} imports {', '.join(summary['heavy'])} at module load")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profiling helpers")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    imports_parser = subparsers.add_parser("imports", help="Check module import times (python -X importtime)")
+    imports_parser.add_argument("modules", nargs="*", default=list(IMPORT_GUARD_MODULES), help="Modules to import")
+    imports_parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS, help="Maximum import time")
+    imports_parser.add_argument("--repeat", type=int, default=3, help="Imports per module (fastest is kept)")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "imports":
+        problems = check_import_times(args.modules, args.budget_ms, args.repeat)
+        for problem in problems:
+            print(f"FAIL: {problem}")
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
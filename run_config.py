@@ -0,0 +1,172 @@
+import argparse
+import json
+from dataclasses import asdict, dataclass, field, fields, replace
+from pathlib import Path
+from typing import Dict, Tuple
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+from config import (
+    YEAR,
+    GP_NAME,
+    SESSIONS,
+    DRIVER_ROOKIE_MAPPING,
+    ROOKIE_DRIVERS,
+    ROOKIE_FULL_NAMES,
+    REGULAR_FULL_NAMES,
+    ALL_DRIVER_NAMES,
+    TEAM_MAPPING,
+    PAIRING_MODE,
+    FUEL_EFFECT_PER_KG,
+    FUEL_CONSUMPTION_KG_PER_LAP,
+    ESTIMATED_START_FUEL_KG,
+    TIRE_DEGRADATION_ESTIMATES,
+    MIN_LAPS_FOR_DEGRADATION,
+    TYRE_SCORE_WEIGHT_BY_LAPS,
+    TRACK_EVOLUTION_WINDOW_MINUTES,
+    MAX_TRACK_EVOLUTION_RATE,
+    OUTLIER_THRESHOLD_PERCENT,
+    LAP_FILTERS,
+    BOOTSTRAP_ENABLED,
+    BOOTSTRAP_RESAMPLES,
+    BOOTSTRAP_SEED,
+    BOOTSTRAP_CONFIDENCE,
+    BOOTSTRAP_WORKERS,
+    CACHE_DIR,
+    OUTPUT_DIR,
+    LAP_CACHE_DIR,
+    LAP_CACHE_MAX_MB,
+    USE_LAP_CACHE,
+    PARALLEL_SESSION_LOADING,
+    RENDER_WORKERS,
+    PLOT_THEME,
+    DEFAULT_LOAD_PROFILE,
+)
+
+
+@dataclass(frozen=True)
+class RunConfig:
+    year: int = YEAR
+    gp_name: str = GP_NAME
+    sessions: Tuple[str, ...] = tuple(SESSIONS)
+    driver_rookie_mapping: Dict[str, str] = field(default_factory=lambda: dict(DRIVER_ROOKIE_MAPPING))
+    rookie_drivers: Tuple[str, ...] = tuple(ROOKIE_DRIVERS)
+    rookie_full_names: Dict[str, str] = field(default_factory=lambda: dict(ROOKIE_FULL_NAMES))
+    regular_full_names: Dict[str, str] = field(default_factory=lambda: dict(REGULAR_FULL_NAMES))
+    all_driver_names: Dict[str, str] = field(default_factory=lambda: dict(ALL_DRIVER_NAMES))
+    team_mapping: Dict[str, str] = field(default_factory=lambda: dict(TEAM_MAPPING))
+    pairing_mode: str = PAIRING_MODE
+    fuel_effect_per_kg: float = FUEL_EFFECT_PER_KG
+    fuel_consumption_kg_per_lap: float = FUEL_CONSUMPTION_KG_PER_LAP
+    estimated_start_fuel_kg: float = ESTIMATED_START_FUEL_KG
+    tire_degradation_estimates: Dict[str, float] = field(default_factory=lambda: dict(TIRE_DEGRADATION_ESTIMATES))
+    min_laps_for_degradation: int = MIN_LAPS_FOR_DEGRADATION
+    tyre_score_weight_by_laps: bool = TYRE_SCORE_WEIGHT_BY_LAPS
+    track_evolution_window_minutes: float = TRACK_EVOLUTION_WINDOW_MINUTES
+    max_track_evolution_rate: float = MAX_TRACK_EVOLUTION_RATE
+    outlier_threshold_percent: float = OUTLIER_THRESHOLD_PERCENT
+    lap_filters: Dict[str, bool] = field(default_factory=lambda: dict(LAP_FILTERS))
+    bootstrap_enabled: bool = BOOTSTRAP_ENABLED
+    bootstrap_resamples: int = BOOTSTRAP_RESAMPLES
+    bootstrap_seed: int = BOOTSTRAP_SEED
+    bootstrap_confidence: float = BOOTSTRAP_CONFIDENCE
+    bootstrap_workers: int = BOOTSTRAP_WORKERS
+    cache_dir: str = CACHE_DIR
+    output_dir: str = OUTPUT_DIR
+    lap_cache_dir: str = LAP_CACHE_DIR
+    lap_cache_max_mb: float = LAP_CACHE_MAX_MB
+    use_lap_cache: bool = USE_LAP_CACHE
+    parallel_session_loading: bool = PARALLEL_SESSION_LOADING
+    load_profile: str = DEFAULT_LOAD_PROFILE
+    render_workers: int = RENDER_WORKERS
+    plot_theme: str = PLOT_THEME
+    
+    @property
+    def regular_drivers(self) -> Tuple[str, ...]:
+        return tuple(self.driver_rookie_mapping)
+    
+    @property
+    def driver_full_names(self) -> Dict[str, str]:
+        return {**self.all_driver_names, **self.rookie_full_names, **self.regular_full_names}
+    
+    @classmethod
+    def from_dict(cls, values: Dict, base: "RunConfig" = None) -> "RunConfig":
+        base = base if base is not None else cls()
+        names = {config_field.name for config_field in fields(cls)}
+        updates = {key.lower(): value for key, value in values.items()}
+        
+        unknown = sorted(set(updates) - names)
+        if unknown:
+            raise ValueError(f"Unknown run config settings: {', '.join(unknown)}")
+        
+        for name in ("sessions", "rookie_drivers"):
+            if name in updates:
+                updates[name] = tuple(updates[name])
+        if "driver_rookie_mapping" in updates and "rookie_drivers" not in updates:
+            updates["rookie_drivers"] = tuple(updates["driver_rookie_mapping"].values())
+        
+        return replace(base, **updates)
+    
+    @classmethod
+    def from_file(cls, path, base: "RunConfig" = None) -> "RunConfig":
+        path = Path(path)
+        if path.suffix == ".toml":
+            if tomllib is None:
+                raise ValueError("Reading TOML run configs requires Python 3.11+ (use JSON instead)")
+            with open(path, "rb") as config_file:
+                values = tomllib.load(config_file)
+        elif path.suffix == ".json":
+            values = json.loads(path.read_text())
+        else:
+            raise ValueError(f"Unsupported run config format '{path.suffix}' (use .toml or .json)")
+        return cls.from_dict(values, base)
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+DEFAULT_RUN_CONFIG = RunConfig()
+
+
+def _parse_setting(setting: str) -> Tuple[str, object]:
+    if "=" not in setting:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got '{setting}'")
+    key, value = setting.split("=", 1)
+    try:
+        return key.strip(), json.loads(value)
+    except json.JSONDecodeError:
+        return key.strip(), value
+
+
+def add_run_config_arguments(parser: argparse.ArgumentParser) -> argparse.ArgumentParser:
+    group = parser.add_argument_group("run configuration")
+    group.add_argument("--config", help="TOML or JSON file of settings (names as in config.py)")
+    group.add_argument("--year", type=int, help="Season year")
+    group.add_argument("--gp", dest="gp_name", help="Grand Prix name")
+    group.add_argument("--pairing", dest="pairing_mode", help="Pairing mode")
+    group.add_argument("--output-dir", help="Directory for CSV, figures and report")
+    group.add_argument(
+        "--set",
+        dest="settings",
+        action="append",
+        type=_parse_setting,
+        default=[],
+        metavar="KEY=VALUE",
+        help="Override any setting; VALUE is parsed as JSON when possible (repeatable)",
+    )
+    return parser
+
+
+def run_config_from_args(args: argparse.Namespace, base: RunConfig = DEFAULT_RUN_CONFIG) -> RunConfig:
+    config = RunConfig.from_file(args.config, base) if args.config else base
+    
+    updates = {
+        name: getattr(args, name)
+        for name in ("year", "gp_name", "pairing_mode", "output_dir")
+        if getattr(args, name) is not None
+    }
+    updates.update(dict(args.settings))
+    return RunConfig.from_dict(updates, config) if updates else config
\ No newline at end of file
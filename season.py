@@ -0,0 +1,275 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from config import SEASON_EVENTS, SEASON_WORKERS, SEASON_RESULTS_DIR
+from run_config import RunConfig, DEFAULT_RUN_CONFIG, add_run_config_arguments, run_config_from_args
+from data_collector import setup_cache, load_all_session_laps
+from lap_cache import event_prefix, get_fastf1_version
+from advanced_analysis import (
+    PreparedSession,
+    calculate_track_evolution_model,
+    calculate_compound_matched_pace,
+    calculate_aggregate_pace_deficit,
+    calculate_long_run_pace,
+    compare_long_run_pace,
+)
+from profiling import memory_summary
+
+
+SEASON_RESULTS_SCHEMA_VERSION = 1
+EVENT_TABLES = ("compound_pace", "aggregate_pace", "long_run_comparison")
+
+
+def event_config(event: Dict, config: RunConfig = DEFAULT_RUN_CONFIG) -> RunConfig:
+    return RunConfig.from_dict(
+        {"year": event["year"], "gp_name": event["gp_name"], "driver_rookie_mapping": event["mapping"]},
+        config,
+    )
+
+
+def event_results_key(config: RunConfig) -> Dict:
+    return {
+        "schema": SEASON_RESULTS_SCHEMA_VERSION,
+        "year": config.year,
+        "gp_name": config.gp_name,
+        "mapping": config.driver_rookie_mapping,
+        "sessions": list(config.sessions),
+        "fastf1": get_fastf1_version(),
+        "filters": config.lap_filters,
+        "parameters": {
+            "fuel_effect": config.fuel_effect_per_kg,
+            "fuel_consumption": config.fuel_consumption_kg_per_lap,
+            "start_fuel": config.estimated_start_fuel_kg,
+            "degradation_estimates": config.tire_degradation_estimates,
+            "min_degradation_laps": config.min_laps_for_degradation,
+            "evolution_window": config.track_evolution_window_minutes,
+            "max_evolution_rate": config.max_track_evolution_rate,
+            "outlier_threshold": config.outlier_threshold_percent,
+        },
+    }
+
+
+def event_results_path(key: Dict) -> Path:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    return Path(SEASON_RESULTS_DIR) / f"{event_prefix(key['year'], key['gp_name'])}_{digest}"
+
+
+def read_event_results(key: Dict) -> Optional[Dict[str, pd.DataFrame]]:
+    path = event_results_path(key)
+    if not (path / "key.json").exists():
+        return None
+    return {name: feather.read_feather(path / f"{name}.feather") for name in EVENT_TABLES}
+
+
+def write_event_results(key: Dict, results: Dict[str, pd.DataFrame]) -> Path:
+    path = event_results_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir()
+    
+    for name in EVENT_TABLES:
+        feather.write_feather(results[name].reset_index(drop=True), tmp_path / f"{name}.feather")
+    (tmp_path / "key.json").write_text(json.dumps(key, sort_keys=True))
+    
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def label_event_drivers(table: pd.DataFrame, drivers: pd.DataFrame) -> pd.DataFrame:
+    if table.empty or drivers.empty:
+        return table
+    
+    drivers = drivers.drop_duplicates("Driver").set_index("Driver")
+    regular_names = table["Regular"].map(drivers["FullName"]).fillna(table["RegularName"])
+    rookie_names = table["Rookie"].map(drivers["FullName"]).fillna(table["RookieName"])
+    rookie_teams = table["Rookie"].map(drivers["Team"]).fillna(table["Team"])
+    
+    return table.assign(
+        RegularName=table["RegularName"].where(table["RegularName"] != table["Regular"], regular_names),
+        RookieName=table["RookieName"].where(table["RookieName"] != table["Rookie"], rookie_names),
+        Team=table["Team"].where(table["Team"] != "Unknown", rookie_teams),
+    )
+
+
+def analyse_event(config: RunConfig) -> Dict[str, pd.DataFrame]:
+    sessions = load_all_session_laps(config=config)
+    fp1 = PreparedSession(sessions["FP1"], "FP1", config)
+    fp2 = PreparedSession(sessions["FP2"], "FP2", config)
+    drivers = pd.concat([fp1.drivers, fp2.drivers], ignore_index=True)
+    
+    fp1_evolution = calculate_track_evolution_model(fp1, config=config)
+    fp2_evolution = calculate_track_evolution_model(fp2, config=config)
+    
+    compound_pace = calculate_compound_matched_pace(
+        fp1, fp2, fp1_evolution, fp2_evolution, "teammate", config=config
+    )
+    compound_pace = label_event_drivers(compound_pace, drivers)
+    
+    long_runs = calculate_long_run_pace(fp1, fp2, fp1_evolution, fp2_evolution, config=config)
+    long_run_comparison = label_event_drivers(compare_long_run_pace(long_runs, "teammate", config=config), drivers)
+    
+    return {
+        "compound_pace": compound_pace,
+        "aggregate_pace": calculate_aggregate_pace_deficit(compound_pace),
+        "long_run_comparison": long_run_comparison,
+    }
+
+
+def _run_event_job(config: RunConfig) -> Tuple[Dict[str, pd.DataFrame], float]:
+    start = time.perf_counter()
+    results = analyse_event(config)
+    return results, time.perf_counter() - start
+
+
+def prewarm_schedules(configs: List[RunConfig]):
+    import fastf1
+    
+    setup_cache(configs[0])
+    for year in sorted({config.year for config in configs}):
+        fastf1.get_event_schedule(year)
+
+
+def merge_event_tables(events: List[Dict], results: List[Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    season = {}
+    for name in EVENT_TABLES:
+        frames = [
+            event_results[name].assign(Year=event["year"], Event=event["gp_name"])
+            for event, event_results in zip(events, results)
+            if not event_results[name].empty
+        ]
+        if not frames:
+            season[name] = pd.DataFrame()
+            continue
+        
+        table = pd.concat(frames, ignore_index=True)
+        season[name] = table[["Year", "Event"] + [column for column in table.columns if column not in ("Year", "Event")]]
+    return season
+
+
+def summarize_season_rookies(aggregate_pace: pd.DataFrame, long_run_comparison: pd.DataFrame) -> pd.DataFrame:
+    if aggregate_pace.empty:
+        return pd.DataFrame()
+    
+    summary = aggregate_pace.groupby("Rookie").agg(
+        RookieName=("RookieName", "first"),
+        Team=("Team", "last"),
+        AvgCorrectedDeficit=("AvgCorrectedDeficit", "mean"),
+        BestEventDeficit=("AvgCorrectedDeficit", "min"),
+        WorstEventDeficit=("AvgCorrectedDeficit", "max"),
+        AvgDeficitPercent=("DeficitPercent", "mean"),
+        TotalRookieLaps=("TotalRookieLaps", "sum"),
+    )
+    summary.insert(2, "Events", aggregate_pace.drop_duplicates(["Rookie", "Year", "Event"]).groupby("Rookie").size())
+    
+    if not long_run_comparison.empty:
+        summary["AvgLongRunDeficit"] = long_run_comparison.groupby("Rookie")["LongRunDeficit"].mean()
+    
+    return summary.reset_index().sort_values("AvgCorrectedDeficit").reset_index(drop=True)
+
+
+def run_season(
+    events: List[Dict] = SEASON_EVENTS,
+    n_workers: int = SEASON_WORKERS,
+    refresh: bool = False,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Tuple[Dict[str, pd.DataFrame], pd.DataFrame]:
+    results = [None] * len(events)
+    status = [None] * len(events)
+    configs = [event_config(event, config) for event in events]
+    keys = [event_results_key(event_run_config) for event_run_config in configs]
+    
+    pending = []
+    for index, key in enumerate(keys):
+        cached = None if refresh else read_event_results(key)
+        if cached is None:
+            pending.append(index)
+        else:
+            results[index] = cached
+            status[index] = ("cache", 0.0)
+    
+    if pending:
+        prewarm_schedules([configs[index] for index in pending])
+    
+    if len(pending) == 1 or n_workers <= 1:
+        for index in pending:
+            results[index], elapsed = _run_event_job(configs[index])
+            write_event_results(keys[index], results[index])
+            status[index] = ("computed", elapsed)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(pending))) as executor:
+            futures = {executor.submit(_run_event_job, configs[index]): index for index in pending}
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index], elapsed = future.result()
+                write_event_results(keys[index], results[index])
+                status[index] = ("computed", elapsed)
+    
+    season = merge_event_tables(events, results)
+    season["rookie_summary"] = summarize_season_rookies(season["aggregate_pace"], season["long_run_comparison"])
+    
+    event_status = pd.DataFrame({
+        "Year": [event["year"] for event in events],
+        "Event": [event["gp_name"] for event in events],
+        "Source": [source for source, _ in status],
+        "Seconds": [elapsed for _, elapsed in status],
+        "Rookies": [
+            event_results["aggregate_pace"]["Rookie"].nunique() if not event_results["aggregate_pace"].empty else 0
+            for event_results in results
+        ],
+    })
+    return season, event_status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the rookie analysis across every configured event")
+    parser.add_argument("--workers", type=int, default=SEASON_WORKERS, help="Events analysed in parallel")
+    parser.add_argument("--event", action="append", help="Only run this event (GP name, repeatable)")
+    parser.add_argument("--refresh", action="store_true", help="Ignore cached per-event results")
+    add_run_config_arguments(parser)
+    args = parser.parse_args(argv)
+    config = run_config_from_args(args)
+    
+    events = [event for event in SEASON_EVENTS if not args.event or event["gp_name"] in args.event]
+    if not events:
+        print("No matching events in SEASON_EVENTS")
+        return
+    
+    print(f"Analysing {len(events)} events with {args.workers} workers...")
+    start = time.perf_counter()
+    season, event_status = run_season(events, args.workers, args.refresh, config)
+    elapsed = time.perf_counter() - start
+    
+    Path(config.output_dir).mkdir(exist_ok=True)
+    for name, table in season.items():
+        if not table.empty:
+            table.to_csv(Path(config.output_dir) / f"season_{name}.csv", index=False)
+    event_status.to_csv(Path(config.output_dir) / "season_events.csv", index=False)
+    
+    for _, row in event_status.iterrows():
+        print(f"  {row['Year']} {row['Event']:<20} {row['Source']:<9} {row['Seconds']:>6.1f}s  {row['Rookies']} rookies")
+    print(memory_summary("after season"))
+    print(f"\nComplete in {elapsed:.1f}s. Output: {config.output_dir}/\n")
+    
+    for _, row in season["rookie_summary"].iterrows():
+        print(
+            f"{row['RookieName']:<20} {row['Events']} events, "
+            f"avg {row['AvgCorrectedDeficit']:+.3f}s "
+            f"(best {row['BestEventDeficit']:+.3f}s, worst {row['WorstEventDeficit']:+.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,241 @@
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Tuple
+from scipy import stats
+
+from config import SENSITIVITY_GRID
+from run_config import RunConfig, DEFAULT_RUN_CONFIG, add_run_config_arguments, run_config_from_args
+from data_collector import load_all_session_laps
+from advanced_analysis import (
+    PreparedSession,
+    as_prepared_session,
+    pair_driver_aggregates,
+    degradation_rates,
+    calculate_compound_matched_pace,
+    calculate_aggregate_pace_deficit,
+)
+
+
+SWEEP_PARAMETERS = ("FuelEffect", "FuelConsumption", "StartFuel", "DegradationScale")
+BASELINE_TOLERANCE = 1e-3
+
+
+def build_parameter_grid(grid: Dict[str, List[float]] = SENSITIVITY_GRID) -> pd.DataFrame:
+    axes = np.meshgrid(*[np.asarray(grid[name], dtype=float) for name in SWEEP_PARAMETERS], indexing="ij")
+    return pd.DataFrame({name: axis.ravel() for name, axis in zip(SWEEP_PARAMETERS, axes)})
+
+
+def baseline_parameters(config: RunConfig = DEFAULT_RUN_CONFIG) -> pd.DataFrame:
+    return pd.DataFrame([{
+        "FuelEffect": config.fuel_effect_per_kg,
+        "FuelConsumption": config.fuel_consumption_kg_per_lap,
+        "StartFuel": config.estimated_start_fuel_kg,
+        "DegradationScale": 0.0,
+    }])
+
+
+def corrected_time_matrix(session, parameters: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    prepared = as_prepared_session(session)
+    laps = prepared.representative_laps
+    session_laps = prepared.fuel_corrected_laps
+    
+    reference_lap = int(session_laps["LapNumber"].median())
+    reference_tyre_lap = session_laps["TyreLap"].median()
+    
+    effect = parameters["FuelEffect"].to_numpy()[:, None]
+    consumption = parameters["FuelConsumption"].to_numpy()[:, None]
+    start_fuel = parameters["StartFuel"].to_numpy()[:, None]
+    degradation_scale = parameters["DegradationScale"].to_numpy()[:, None]
+    
+    lap_numbers = laps["LapNumber"].to_numpy(dtype=float)
+    fuel_at_lap = np.maximum(start_fuel - (lap_numbers - 1) * consumption, 5)
+    fuel_at_reference = np.maximum(start_fuel - (reference_lap - 1) * consumption, 5)
+    
+    deg_rates = degradation_rates(session_laps["Compound"], prepared.empirical_degradation, prepared.config)
+    deg_rate = laps["Compound"].map(deg_rates).astype(float).fillna(0.05).to_numpy()
+    tyre_correction = (laps["TyreLap"].to_numpy(dtype=float) - reference_tyre_lap) * deg_rate * -1
+    
+    times = (
+        laps["LapTimeSeconds"].to_numpy(dtype=float)
+        + (fuel_at_lap - fuel_at_reference) * effect
+        + degradation_scale * tyre_correction
+    )
+    return laps, times
+
+
+def best_times_by_key(laps: pd.DataFrame, times: np.ndarray, keys: pd.DataFrame) -> np.ndarray:
+    codes = pd.MultiIndex.from_frame(keys).get_indexer(pd.MultiIndex.from_frame(laps[["Driver", "Compound"]]))
+    rows = np.flatnonzero(codes >= 0)
+    rows = rows[np.argsort(codes[rows], kind="stable")]
+    offsets = np.searchsorted(codes[rows], np.arange(len(keys)))
+    return np.fmin.reduceat(times[:, rows], offsets, axis=1)
+
+
+def mean_by_code(values: np.ndarray, codes: np.ndarray, n_groups: int) -> np.ndarray:
+    weights = np.zeros((len(codes), n_groups))
+    weights[np.arange(len(codes)), codes] = 1
+    return values @ (weights / weights.sum(axis=0))
+
+
+def paired_deficit_matrix(
+    pairs: pd.DataFrame,
+    rookie_laps: pd.DataFrame,
+    rookie_times: np.ndarray,
+    regular_laps: pd.DataFrame,
+    regular_times: np.ndarray,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    rookie_keys = pairs[["Rookie", "Compound"]].drop_duplicates().rename(columns={"Rookie": "Driver"})
+    regular_keys = pairs[["Regular", "Compound"]].drop_duplicates().rename(columns={"Regular": "Driver"})
+    
+    rookie_best = best_times_by_key(rookie_laps, rookie_times, rookie_keys)
+    regular_best = best_times_by_key(regular_laps, regular_times, regular_keys)
+    
+    rookie_position = pd.MultiIndex.from_frame(rookie_keys).get_indexer(
+        pd.MultiIndex.from_frame(pairs[["Rookie", "Compound"]])
+    )
+    regular_position = pd.MultiIndex.from_frame(regular_keys).get_indexer(
+        pd.MultiIndex.from_frame(pairs[["Regular", "Compound"]])
+    )
+    compound_deficits = rookie_best[:, rookie_position] - regular_best[:, regular_position]
+    
+    pair_table = pairs.drop_duplicates(["Regular", "Rookie"])[["Regular", "RegularName", "Rookie", "RookieName", "Team"]]
+    pair_table = pair_table.reset_index(drop=True)
+    pair_codes = pd.MultiIndex.from_frame(pair_table[["Regular", "Rookie"]]).get_indexer(
+        pd.MultiIndex.from_frame(pairs[["Regular", "Rookie"]])
+    )
+    return pair_table, mean_by_code(compound_deficits, pair_codes, len(pair_table))
+
+
+def rookie_deficit_matrix(pair_table: pd.DataFrame, pair_deficits: np.ndarray) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    rookie_codes, rookies = pd.factorize(pair_table["Rookie"])
+    rookie_table = pair_table.drop_duplicates("Rookie").set_index("Rookie").loc[rookies, ["RookieName", "Team"]]
+    return rookie_table.rename_axis("Rookie").reset_index(), rookie_codes, mean_by_code(pair_deficits, rookie_codes, len(rookies))
+
+
+def baseline_error(fp1: PreparedSession, fp2: PreparedSession, pairing, pair_table: pd.DataFrame, baseline_deficits: np.ndarray) -> float:
+    compound_pace = calculate_compound_matched_pace(fp1, fp2, None, None, pairing, config=fp1.config)
+    published = calculate_aggregate_pace_deficit(compound_pace).set_index(["Regular", "Rookie"])["AvgCorrectedDeficit"]
+    published = published.reindex(pd.MultiIndex.from_frame(pair_table[["Regular", "Rookie"]])).to_numpy()
+    return float(np.max(np.abs(published - baseline_deficits)))
+
+
+def run_sensitivity_sweep(
+    fp1_session,
+    fp2_session,
+    pairing=None,
+    grid: Dict[str, List[float]] = SENSITIVITY_GRID,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    fp1 = as_prepared_session(fp1_session, config)
+    fp2 = as_prepared_session(fp2_session, config)
+    
+    pairs = pair_driver_aggregates(
+        fp1.representative_laps,
+        fp2.representative_laps,
+        {"LapCount": ("LapTimeSeconds", "size")},
+        pairing,
+        config=config,
+    )
+    
+    if pairs.empty:
+        return pd.DataFrame(), pd.DataFrame()
+    
+    grid_parameters = build_parameter_grid(grid)
+    parameters = pd.concat([baseline_parameters(config), grid_parameters], ignore_index=True)
+    
+    pair_table, pair_deficits = paired_deficit_matrix(
+        pairs,
+        *corrected_time_matrix(fp1, parameters),
+        *corrected_time_matrix(fp2, parameters),
+    )
+    error = baseline_error(fp1, fp2, pairing, pair_table, pair_deficits[0])
+    if not error <= BASELINE_TOLERANCE:
+        raise ValueError(f"Sensitivity baseline differs from the published deficits by {error:.4f}s")
+    
+    rookie_table, rookie_codes, rookie_deficits = rookie_deficit_matrix(pair_table, pair_deficits)
+    rookie_ranks = stats.rankdata(rookie_deficits, method="min", axis=1).astype(int)
+    
+    baseline_ranks = rookie_ranks[0]
+    concordance = (
+        np.sign(rookie_ranks[:, :, None] - rookie_ranks[:, None, :]) *
+        np.sign(baseline_ranks[:, None] - baseline_ranks[None, :])
+    )
+    n_orderings = max(len(rookie_table) * (len(rookie_table) - 1), 1)
+    ranking_tau = concordance.sum(axis=(1, 2)) / n_orderings
+    
+    n_combinations = len(grid_parameters)
+    n_pairs = len(pair_table)
+    sweep = pd.concat([
+        grid_parameters.loc[np.repeat(np.arange(n_combinations), n_pairs)].reset_index(drop=True),
+        pair_table.loc[np.tile(np.arange(n_pairs), n_combinations)].reset_index(drop=True),
+    ], axis=1)
+    sweep["AvgCorrectedDeficit"] = pair_deficits[1:].ravel()
+    sweep["BaselineDeficit"] = np.tile(pair_deficits[0], n_combinations)
+    sweep["DeficitChange"] = sweep["AvgCorrectedDeficit"] - sweep["BaselineDeficit"]
+    sweep["RookieRank"] = rookie_ranks[1:][:, rookie_codes].ravel()
+    sweep["RankingTau"] = np.repeat(ranking_tau[1:], n_pairs)
+    
+    grid_ranks = rookie_ranks[1:]
+    grid_deficits = rookie_deficits[1:]
+    stability = rookie_table.assign(
+        BaselineDeficit=rookie_deficits[0],
+        MinDeficit=grid_deficits.min(axis=0),
+        MaxDeficit=grid_deficits.max(axis=0),
+        BaselineRank=baseline_ranks,
+        MedianRank=np.median(grid_ranks, axis=0),
+        BestRank=grid_ranks.min(axis=0),
+        WorstRank=grid_ranks.max(axis=0),
+        ShareAtBaselineRank=(grid_ranks == baseline_ranks).mean(axis=0),
+    ).sort_values("BaselineRank").reset_index(drop=True)
+    
+    stability.attrs["baseline_error"] = error
+    stability.attrs["min_ranking_tau"] = float(ranking_tau[1:].min())
+    stability.attrs["mean_ranking_tau"] = float(ranking_tau[1:].mean())
+    stability.attrs["unchanged_rankings"] = float((grid_ranks == baseline_ranks).all(axis=1).mean())
+    
+    return sweep, stability
+
+
+def main(argv=None, config: RunConfig = DEFAULT_RUN_CONFIG):
+    parser = argparse.ArgumentParser(description="Sweep fuel and degradation constants around the published deficits")
+    add_run_config_arguments(parser)
+    config = run_config_from_args(parser.parse_args(argv), config)
+    
+    print("Loading session data...")
+    sessions = load_all_session_laps(config=config)
+    fp1 = PreparedSession(sessions["FP1"], "FP1", config)
+    fp2 = PreparedSession(sessions["FP2"], "FP2", config)
+    
+    print("Running sensitivity sweep...")
+    start = time.perf_counter()
+    sweep, stability = run_sensitivity_sweep(fp1, fp2, config=config)
+    elapsed = time.perf_counter() - start
+    
+    if sweep.empty:
+        print("No rookie/regular pairs with matching compounds")
+        return
+    
+    Path(config.output_dir).mkdir(exist_ok=True)
+    sweep.to_csv(Path(config.output_dir) / "sensitivity_sweep.csv", index=False)
+    stability.to_csv(Path(config.output_dir) / "sensitivity_rank_stability.csv", index=False)
+    
+    n_combinations = len(sweep) // sweep[["Regular", "Rookie"]].drop_duplicates().shape[0]
+    print(f"\n{n_combinations} parameter combinations in {elapsed:.2f}s")
+    print(f"Baseline matches published deficits to {stability.attrs['baseline_error']:.1e}s")
+    print(f"Rankings unchanged: {stability.attrs['unchanged_rankings']:.1%}")
+    print(f"Kendall tau vs baseline: mean {stability.attrs['mean_ranking_tau']:.3f}, min {stability.attrs['min_ranking_tau']:.3f}\n")
+    
+    for _, row in stability.iterrows():
+        print(
+            f"{row['BaselineRank']:>2}. {row['RookieName']:<20} "
+            f"ranks {row['BestRank']}-{row['WorstRank']} "
+            f"({row['ShareAtBaselineRank']:.0%} at baseline), "
+            f"deficit {row['MinDeficit']:+.3f}s to {row['MaxDeficit']:+.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
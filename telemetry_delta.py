@@ -0,0 +1,296 @@
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import (
+    OUTPUT_DIR,
+    DRIVER_ROOKIE_MAPPING,
+    TELEMETRY_GRID_METERS,
+    TELEMETRY_MINISECTORS,
+    TELEMETRY_TRACE_POINTS,
+    TELEMETRY_TRACE_DOWNSAMPLING,
+)
+from run_config import RunConfig, DEFAULT_RUN_CONFIG
+from advanced_analysis import driver_name
+from advanced_visualizations import plot_minisector_heatmap, plot_telemetry_traces, render_figures
+from telemetry_store import TelemetryStore, load_telemetry_stores
+from profiling import memory_summary
+
+
+TRACE_CHANNELS = ("Time", "Speed")
+PLOT_CHANNELS = ("Speed", "Throttle")
+
+
+def extract_lap_trace(lap: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    distance = np.maximum.accumulate(np.asarray(lap["Distance"], dtype=float))
+    return {
+        "Distance": distance - distance[0],
+        "Time": np.asarray(lap["Time"], dtype=float),
+        "Speed": np.asarray(lap["Speed"], dtype=float),
+    }
+
+
+def load_pair_traces(
+    fp1_store: TelemetryStore,
+    fp2_store: TelemetryStore,
+    mapping: Dict[str, str] = DRIVER_ROOKIE_MAPPING,
+) -> Tuple[pd.DataFrame, List[Dict[str, np.ndarray]], List[Dict[str, np.ndarray]]]:
+    pairs = []
+    rookie_traces = []
+    regular_traces = []
+    
+    for regular, rookie in mapping.items():
+        rookie_telemetry = fp1_store.best_lap(rookie, ("Distance",) + TRACE_CHANNELS)
+        regular_telemetry = fp2_store.best_lap(regular, ("Distance",) + TRACE_CHANNELS)
+        if len(rookie_telemetry.get("Distance", ())) < 2 or len(regular_telemetry.get("Distance", ())) < 2:
+            continue
+        
+        pairs.append({"Regular": regular, "Rookie": rookie})
+        rookie_traces.append(extract_lap_trace(rookie_telemetry))
+        regular_traces.append(extract_lap_trace(regular_telemetry))
+    
+    return pd.DataFrame(pairs, columns=["Regular", "Rookie"]), rookie_traces, regular_traces
+
+
+def resample_traces(
+    traces: List[Dict[str, np.ndarray]],
+    grid: np.ndarray,
+    track_length: float,
+    channels: Tuple[str, ...] = TRACE_CHANNELS,
+) -> Dict[str, np.ndarray]:
+    span = track_length * 2
+    offsets = np.arange(len(traces)) * span
+    
+    lap_lengths = np.array([trace["Distance"][-1] for trace in traces])
+    scale = np.repeat(track_length / lap_lengths, [len(trace["Distance"]) for trace in traces])
+    lap_offsets = np.repeat(offsets, [len(trace["Distance"]) for trace in traces])
+    sample_distance = np.concatenate([trace["Distance"] for trace in traces]) * scale + lap_offsets
+    query_distance = (grid[None, :] + offsets[:, None]).ravel()
+    
+    resampled = {}
+    for channel in channels:
+        values = np.concatenate([trace[channel] for trace in traces])
+        resampled[channel] = np.interp(query_distance, sample_distance, values).reshape(len(traces), len(grid))
+    return resampled
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    n_samples = len(x)
+    if n_points >= n_samples or n_points < 3:
+        return np.arange(n_samples)
+    
+    edges = np.linspace(1, n_samples - 1, n_points - 1).astype(int)
+    selected = np.empty(n_points, dtype=int)
+    selected[0], selected[-1] = 0, n_samples - 1
+    
+    for bucket in range(n_points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n_samples
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+        
+        previous = selected[bucket]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        selected[bucket + 1] = start + int(areas.argmax())
+    
+    return selected
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    n_samples = len(x)
+    if n_points >= n_samples or n_points < 4:
+        return np.arange(n_samples)
+    
+    edges = np.linspace(1, n_samples - 1, (n_points - 2) // 2 + 1).astype(int)
+    selected = [0, n_samples - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        bucket = y[start:stop]
+        selected.extend((start + int(bucket.argmin()), start + int(bucket.argmax())))
+    return np.unique(selected)
+
+
+DOWNSAMPLERS = {"lttb": lttb_indices, "minmax": minmax_indices}
+
+
+def downsample_trace(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_points: int = TELEMETRY_TRACE_POINTS,
+    method: str = TELEMETRY_TRACE_DOWNSAMPLING,
+) -> Tuple[np.ndarray, np.ndarray]:
+    if method not in DOWNSAMPLERS:
+        available = ", ".join(DOWNSAMPLERS)
+        raise ValueError(f"Unknown downsampling method '{method}' (available: {available})")
+    indices = DOWNSAMPLERS[method](x, y, n_points)
+    return x[indices], y[indices]
+
+
+def build_trace_frame(
+    fp1_store: TelemetryStore,
+    fp2_store: TelemetryStore,
+    mapping: Optional[Dict[str, str]] = None,
+    channels: Tuple[str, ...] = PLOT_CHANNELS,
+    n_points: int = TELEMETRY_TRACE_POINTS,
+    method: str = TELEMETRY_TRACE_DOWNSAMPLING,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> pd.DataFrame:
+    mapping = mapping if mapping is not None else config.driver_rookie_mapping
+    laps = []
+    for regular, rookie in mapping.items():
+        rookie_telemetry = fp1_store.best_lap(rookie, ("Distance",) + channels)
+        regular_telemetry = fp2_store.best_lap(regular, ("Distance",) + channels)
+        if len(rookie_telemetry.get("Distance", ())) < 2 or len(regular_telemetry.get("Distance", ())) < 2:
+            continue
+        laps.append((regular, rookie, "Rookie", rookie, rookie_telemetry))
+        laps.append((regular, rookie, "Regular", regular, regular_telemetry))
+    
+    columns = ["Regular", "RegularName", "Rookie", "RookieName", "Team", "Role", "Driver", "Channel", "Distance", "Value"]
+    if not laps:
+        return pd.DataFrame(columns=columns)
+    
+    distances = [np.maximum.accumulate(np.asarray(lap["Distance"], dtype=float)) for *_, lap in laps]
+    distances = [distance - distance[0] for distance in distances]
+    track_length = float(np.median([distance[-1] for distance in distances]))
+    
+    frames = []
+    for (regular, rookie, role, driver, lap), distance in zip(laps, distances):
+        distance = distance * (track_length / distance[-1])
+        for channel in channels:
+            trace_distance, values = downsample_trace(distance, np.asarray(lap[channel], dtype=float), n_points, method)
+            frames.append(pd.DataFrame({
+                "Regular": regular,
+                "RegularName": driver_name(regular, config.regular_full_names, config),
+                "Rookie": rookie,
+                "RookieName": driver_name(rookie, config.rookie_full_names, config),
+                "Team": config.team_mapping.get(rookie, "Unknown"),
+                "Role": role,
+                "Driver": driver,
+                "Channel": channel,
+                "Distance": trace_distance.astype(np.float32),
+                "Value": values.astype(np.float32),
+            }))
+    
+    return pd.concat(frames, ignore_index=True)[columns]
+
+
+class TelemetryDelta:
+    def __init__(
+        self,
+        pairs: pd.DataFrame,
+        rookie_traces: List[Dict[str, np.ndarray]],
+        regular_traces: List[Dict[str, np.ndarray]],
+        resolution: float = TELEMETRY_GRID_METERS,
+        n_minisectors: int = TELEMETRY_MINISECTORS,
+        config: RunConfig = DEFAULT_RUN_CONFIG,
+    ):
+        self.pairs = pairs.reset_index(drop=True)
+        self.config = config
+        self.track_length = float(np.median([trace["Distance"][-1] for trace in rookie_traces + regular_traces]))
+        self.distance = np.arange(0, self.track_length, resolution)
+        
+        rookie = resample_traces(rookie_traces, self.distance, self.track_length)
+        regular = resample_traces(regular_traces, self.distance, self.track_length)
+        self.time_delta = rookie["Time"] - regular["Time"]
+        self.speed_delta = rookie["Speed"] - regular["Speed"]
+        
+        self.minisector_bounds = np.linspace(0, len(self.distance) - 1, n_minisectors + 1).astype(int)
+        self.minisector_loss = np.diff(self.time_delta[:, self.minisector_bounds], axis=1)
+        minisector_starts = self.minisector_bounds[:-1]
+        minisector_points = np.diff(np.append(minisector_starts, len(self.distance)))
+        self.minisector_speed_delta = np.add.reduceat(self.speed_delta, minisector_starts, axis=1) / minisector_points
+    
+    def _pair_labels(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "Regular": self.pairs["Regular"],
+            "RegularName": self.pairs["Regular"].map(lambda x: driver_name(x, self.config.regular_full_names, self.config)),
+            "Rookie": self.pairs["Rookie"],
+            "RookieName": self.pairs["Rookie"].map(lambda x: driver_name(x, self.config.rookie_full_names, self.config)),
+            "Team": self.pairs["Rookie"].map(lambda x: self.config.team_mapping.get(x, "Unknown")),
+        })
+    
+    def minisector_losses(self) -> pd.DataFrame:
+        n_pairs, n_minisectors = self.minisector_loss.shape
+        labels = self._pair_labels().loc[np.repeat(np.arange(n_pairs), n_minisectors)].reset_index(drop=True)
+        
+        bounds = self.distance[self.minisector_bounds]
+        return labels.assign(
+            MiniSector=np.tile(np.arange(1, n_minisectors + 1), n_pairs),
+            StartDistance=np.tile(bounds[:-1], n_pairs),
+            EndDistance=np.tile(bounds[1:], n_pairs),
+            TimeLoss=self.minisector_loss.ravel(),
+            MeanSpeedDelta=self.minisector_speed_delta.ravel(),
+        )
+    
+    def summary(self) -> pd.DataFrame:
+        worst = self.minisector_loss.argmax(axis=1)
+        return self._pair_labels().assign(
+            FinalDelta=self.time_delta[:, -1],
+            MaxTimeLoss=self.time_delta.max(axis=1),
+            MaxSpeedDeficit=self.speed_delta.min(axis=1),
+            MeanSpeedDelta=self.speed_delta.mean(axis=1),
+            WorstMiniSector=worst + 1,
+            WorstMiniSectorLoss=self.minisector_loss[np.arange(len(worst)), worst],
+        )
+
+
+def calculate_telemetry_deltas(
+    fp1_store: TelemetryStore,
+    fp2_store: TelemetryStore,
+    mapping: Optional[Dict[str, str]] = None,
+    resolution: float = TELEMETRY_GRID_METERS,
+    n_minisectors: int = TELEMETRY_MINISECTORS,
+    config: RunConfig = DEFAULT_RUN_CONFIG,
+) -> Optional[TelemetryDelta]:
+    mapping = mapping if mapping is not None else config.driver_rookie_mapping
+    pairs, rookie_traces, regular_traces = load_pair_traces(fp1_store, fp2_store, mapping)
+    if pairs.empty:
+        return None
+    return TelemetryDelta(pairs, rookie_traces, regular_traces, resolution, n_minisectors, config)
+
+
+def main():
+    print("Opening telemetry store...")
+    stores = load_telemetry_stores()
+    print(memory_summary("after opening stores"))
+    
+    print("Aligning best-lap telemetry...")
+    start = time.perf_counter()
+    deltas = calculate_telemetry_deltas(stores["FP1"], stores["FP2"])
+    elapsed = time.perf_counter() - start
+    
+    if deltas is None:
+        print("No pairs with telemetry for both drivers")
+        return
+    
+    minisectors = deltas.minisector_losses()
+    summary = deltas.summary()
+    
+    Path(OUTPUT_DIR).mkdir(exist_ok=True)
+    minisectors.to_csv(Path(OUTPUT_DIR) / "telemetry_minisectors.csv", index=False)
+    summary.to_csv(Path(OUTPUT_DIR) / "telemetry_delta_summary.csv", index=False)
+    
+    traces = build_trace_frame(stores["FP1"], stores["FP2"])
+    plot_jobs = {"minisector_heatmap": (plot_minisector_heatmap, (minisectors, "FP1 vs FP2"))}
+    for channel in PLOT_CHANNELS:
+        plot_jobs[f"telemetry_trace_{channel.lower()}"] = (
+            plot_telemetry_traces,
+            (traces[traces["Channel"] == channel], channel, "FP1 vs FP2"),
+        )
+    render_figures(plot_jobs)
+    
+    print(f"\n{len(summary)} pairs on a {len(deltas.distance)} point grid in {elapsed:.2f}s\n")
+    
+    for _, row in summary.sort_values("FinalDelta").iterrows():
+        print(
+            f"{row['RookieName']:<20} {row['FinalDelta']:+.3f}s vs {row['RegularName']}, "
+            f"worst mini-sector {row['WorstMiniSector']} ({row['WorstMiniSectorLoss']:+.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,233 @@
+import argparse
+import gc
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+
+from config import YEAR, GP_NAME, SESSIONS, TELEMETRY_STORE_DIR, LAP_FILTERS
+from data_collector import load_all_sessions, filter_session_laps, get_telemetry_for_lap
+from lap_cache import event_prefix, get_fastf1_version
+
+
+TELEMETRY_STORE_SCHEMA_VERSION = 1
+LOAD_PROFILE = "full-telemetry"
+
+TELEMETRY_CHANNELS = {
+    "Time": np.float32,
+    "Distance": np.float32,
+    "Speed": np.float32,
+    "Throttle": np.float32,
+    "Brake": np.bool_,
+    "nGear": np.int8,
+    "RPM": np.float32,
+}
+
+
+def telemetry_store_key(session_name: str, year: int = YEAR, gp_name: str = GP_NAME) -> Dict:
+    return {
+        "schema": TELEMETRY_STORE_SCHEMA_VERSION,
+        "year": year,
+        "gp_name": gp_name,
+        "session": session_name,
+        "fastf1": get_fastf1_version(),
+        "filters": LAP_FILTERS,
+        "channels": list(TELEMETRY_CHANNELS),
+    }
+
+
+def telemetry_store_path(key: Dict) -> Path:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+    prefix = event_prefix(key["year"], key["gp_name"])
+    return Path(TELEMETRY_STORE_DIR) / f"{prefix}_{key['session']}_{digest}"
+
+
+def _channel_values(telemetry: pd.DataFrame, channel: str, dtype) -> np.ndarray:
+    values = telemetry[channel]
+    if channel == "Time":
+        values = values.dt.total_seconds()
+    if np.issubdtype(dtype, np.integer):
+        values = values.fillna(0)
+    return values.to_numpy().astype(dtype)
+
+
+class TelemetryStore:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.index = feather.read_feather(self.path / "index.feather")
+        self._channels = {}
+    
+    def channel(self, name: str) -> np.ndarray:
+        if name not in self._channels:
+            self._channels[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._channels[name]
+    
+    def _slice(self, row, channels) -> Dict[str, np.ndarray]:
+        start, stop = int(row["Start"]), int(row["Stop"])
+        return {name: self.channel(name)[start:stop] for name in channels}
+    
+    def lap(self, driver: str, lap_number: int, channels=tuple(TELEMETRY_CHANNELS)) -> Dict[str, np.ndarray]:
+        rows = self.index[(self.index["Driver"] == driver) & (self.index["LapNumber"] == lap_number)]
+        if rows.empty:
+            return {}
+        return self._slice(rows.iloc[0], channels)
+    
+    def best_lap(self, driver: str, channels=tuple(TELEMETRY_CHANNELS)) -> Dict[str, np.ndarray]:
+        rows = self.index[self.index["Driver"] == driver]
+        if rows.empty:
+            return {}
+        return self._slice(rows.loc[rows["LapTimeSeconds"].idxmin()], channels)
+    
+    def driver_laps(self, driver: str, channels=tuple(TELEMETRY_CHANNELS)) -> List[Dict[str, np.ndarray]]:
+        rows = self.index[self.index["Driver"] == driver]
+        return [self._slice(row, channels) for _, row in rows.iterrows()]
+
+
+def open_telemetry_store(
+    session_name: str,
+    year: int = YEAR,
+    gp_name: str = GP_NAME,
+) -> Optional[TelemetryStore]:
+    path = telemetry_store_path(telemetry_store_key(session_name, year, gp_name))
+    if not (path / "index.feather").exists():
+        return None
+    return TelemetryStore(path)
+
+
+def build_telemetry_store(
+    session,
+    session_name: str,
+    year: int = YEAR,
+    gp_name: str = GP_NAME,
+) -> TelemetryStore:
+    key = telemetry_store_key(session_name, year, gp_name)
+    path = telemetry_store_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    chunks = {channel: [] for channel in TELEMETRY_CHANNELS}
+    index_rows = []
+    offset = 0
+    
+    laps = filter_session_laps(session)
+    for _, lap in laps.iterlaps():
+        telemetry = get_telemetry_for_lap(lap)
+        if telemetry.empty:
+            continue
+        
+        for channel, dtype in TELEMETRY_CHANNELS.items():
+            chunks[channel].append(_channel_values(telemetry, channel, dtype))
+        
+        index_rows.append({
+            "Driver": lap["Driver"],
+            "LapNumber": int(lap["LapNumber"]),
+            "Compound": lap["Compound"],
+            "LapTimeSeconds": lap["LapTime"].total_seconds(),
+            "Start": offset,
+            "Stop": offset + len(telemetry),
+        })
+        offset += len(telemetry)
+    
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir()
+    
+    for channel, dtype in TELEMETRY_CHANNELS.items():
+        values = np.concatenate(chunks[channel]) if chunks[channel] else np.empty(0, dtype=dtype)
+        np.save(tmp_path / f"{channel}.npy", values)
+    
+    index = pd.DataFrame(index_rows, columns=["Driver", "LapNumber", "Compound", "LapTimeSeconds", "Start", "Stop"])
+    feather.write_feather(index, tmp_path / "index.feather")
+    (tmp_path / "key.json").write_text(json.dumps(key, sort_keys=True))
+    
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return TelemetryStore(path)
+
+
+def load_telemetry_stores(session_names=SESSIONS) -> Dict[str, TelemetryStore]:
+    stores = {}
+    for session_name in session_names:
+        store = open_telemetry_store(session_name)
+        if store is not None:
+            stores[session_name] = store
+    
+    missing = [name for name in session_names if name not in stores]
+    if missing:
+        sessions = load_all_sessions(profile=LOAD_PROFILE, session_names=missing)
+        for session_name in missing:
+            stores[session_name] = build_telemetry_store(sessions.pop(session_name), session_name)
+        del sessions
+        gc.collect()
+    
+    return {name: stores[name] for name in session_names}
+
+
+def list_telemetry_stores() -> List[Path]:
+    store_path = Path(TELEMETRY_STORE_DIR)
+    if not store_path.exists():
+        return []
+    return sorted(path for path in store_path.iterdir() if (path / "index.feather").exists())
+
+
+def invalidate_telemetry_stores(
+    session_name: Optional[str] = None,
+    year: Optional[int] = YEAR,
+    gp_name: Optional[str] = GP_NAME,
+) -> List[Path]:
+    if year is None or gp_name is None:
+        pattern = "*"
+    elif session_name is None:
+        pattern = f"{event_prefix(year, gp_name)}_*"
+    else:
+        pattern = f"{event_prefix(year, gp_name)}_{session_name}_*"
+    
+    removed = []
+    for path in Path(TELEMETRY_STORE_DIR).glob(pattern):
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the memory-mapped telemetry store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build_parser = subparsers.add_parser("build", help="Extract telemetry channels for the configured event")
+    build_parser.add_argument("--session", action="append", help="Only build this session (repeatable)")
+    
+    subparsers.add_parser("list", help="List stored sessions")
+    
+    clear_parser = subparsers.add_parser("clear", help="Remove stored telemetry")
+    clear_parser.add_argument("--session", help="Only clear this session (e.g. FP1)")
+    clear_parser.add_argument("--all-events", action="store_true", help="Clear every event, not just the configured one")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "build":
+        session_names = args.session or SESSIONS
+        sessions = load_all_sessions(profile=LOAD_PROFILE, session_names=session_names)
+        for session_name in session_names:
+            store = build_telemetry_store(sessions.pop(session_name), session_name)
+            gc.collect()
+            print(f"{session_name}: {len(store.index)} laps, {len(store.channel('Time'))} samples")
+    elif args.command == "list":
+        for path in list_telemetry_stores():
+            size = sum(entry.stat().st_size for entry in path.iterdir())
+            n_laps = len(feather.read_table(path / "index.feather"))
+            print(f"{size / 1024 / 1024:>8.1f} MB  {n_laps:>4} laps  {path.name}")
+    elif args.command == "clear":
+        if args.all_events:
+            removed = invalidate_telemetry_stores(year=None, gp_name=None)
+        else:
+            removed = invalidate_telemetry_stores(args.session)
+        print(f"Removed {len(removed)} telemetry stores")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file